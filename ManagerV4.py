@@ -32,16 +32,24 @@ PERMISSION_VIEW_ALL=admins
 3. Для изменения прав требуется редактирование файла .env
 """
 
+import asyncio
+import atexit
+import concurrent.futures
+import functools
 import os
 import logging
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes, ConversationHandler
-from telegram.error import BadRequest
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes, ConversationHandler, AIORateLimiter, PicklePersistence
+from telegram.error import BadRequest, RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 from database import (
     init_db, get_or_create_user, create_request, update_request_status,
-    add_comment, RequestStatus, get_requests, get_request, get_requests_paginated, get_request_comments,
+    add_comment, RequestStatus, get_requests, get_request, get_request_with_details, get_requests_paginated,
     update_request, User
 )
 from validators import (
@@ -49,7 +57,7 @@ from validators import (
     validate_period, validate_date, validate_comment,
     validate_rejection_reason, validate_edit_value
 )
-import json
+import orjson
 import tempfile
 import shutil
 from typing import List, Dict
@@ -66,17 +74,24 @@ load_dotenv('bot.env')
 timeDelta=3 #Delta for UTC+3
 
 # Enable logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s\n'
-           'Function: %(funcName)s\n'
-           'Line: %(lineno)d\n'
-           'Message: %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
+# Записи уходят в очередь, а файловый и консольный вывод выполняет фоновый
+# поток QueueListener — дисковый ввод-вывод не блокирует событийный цикл
+_log_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s\n'
+    'Function: %(funcName)s\n'
+    'Line: %(lineno)d\n'
+    'Message: %(message)s'
 )
+_log_file_handler = logging.FileHandler('bot.log')
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, _log_file_handler, _log_stream_handler)
+_log_listener.start()
+# При завершении процесса дописываем накопившиеся записи из очереди
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # States for conversation handler
@@ -103,6 +118,73 @@ logger = logging.getLogger(__name__)
     EXPORT_FORMAT
 ) = range(20)
 
+# Паттерны callback-данных компилируются один раз на импорте;
+# PTB принимает готовые re.Pattern вместо строк
+ATTACH_PATTERN = re.compile(r"^attach$")
+PARTNER_PATTERN = re.compile(r"^partner$")
+SKIP_PATTERN = re.compile(r"^skip$")
+DATE_PATTERN = re.compile(r"^date_")
+REQUEST_ACTION_PATTERN = re.compile(r"^(approve|reject|edit|comment)_")
+BACK_TO_LIST_PATTERN = re.compile(r"^back_to_list$")
+VIEW_PATTERN = re.compile(r"^view_")
+# Объединённый паттерн экрана деталей заявки: один CallbackQueryHandler
+# матчит callback_data за один проход вместо трёх последовательных проверок
+DETAIL_ACTION_PATTERN = re.compile(r"^(approve|reject|edit|comment)_|^back_to_list$|^view_")
+EDIT_OR_VIEW_PATTERN = re.compile(r"^(edit_|view_)")
+SET_CURRENCY_PATTERN = re.compile(r"^set_currency_")
+
+# Статичные клавиатуры иммутабельны — собираем один раз на импорте,
+# а не на каждом ответе в пути обработки ошибок
+SUPPORT_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]]
+)
+BACK_TO_LIST_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]]
+)
+
+
+# Таблицы фильтров списка заявок: разрешение фильтра в статус и заголовок
+# одним обращением к словарю вместо getattr(RequestStatus, ...) с upper()
+_FILTER_TO_STATUS = {
+    "pending": RequestStatus.PENDING,
+    "waiting": RequestStatus.WAITING,
+    "paid": RequestStatus.PAID,
+    "rejected": RequestStatus.REJECTED,
+    "all": None,
+}
+_FILTER_TITLES = {
+    "pending": "⏳ Ожидают подтверждения",
+    "waiting": "💰 Одобрено/Ожидают оплаты",
+    "paid": "✅ Оплаченные",
+    "rejected": "❌ Отклоненные",
+    "all": "📋 Все заявки",
+}
+
+
+def _format_dt(dt):
+    """Отформатировать дату как ДД/ММ/ГГГГ ЧЧ:ММ без strftime.
+
+    f-строка с целочисленными компонентами обходится дешевле, чем
+    strftime с его locale-машинерией — формат вызывается на каждую
+    строку списка заявок и каждую запись истории/комментарий.
+    """
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _format_dt_seconds(dt):
+    """То же, что _format_dt, но с секундами (метки комментариев)."""
+    return f"{dt.day:02d}/{dt.month:02d}/{dt.year} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+class ORJSONRequest(HTTPXRequest):
+    """HTTPXRequest, разбирающий ответы Bot API через orjson вместо stdlib json."""
+
+    def parse_json_payload(self, payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except ValueError as exc:
+            logger.exception('Can not load invalid JSON data: "%s"', payload.decode("utf-8", "replace"))
+            raise TelegramError("Invalid server response") from exc
+
 class BotConfig:
     """Configuration class for the bot."""
     # Define SOURCES before __init__
@@ -124,6 +206,19 @@ class BotConfig:
         if not self.TELEGRAM_TOKEN:
             raise ValueError("No TELEGRAM_TOKEN found in environment variables!")
 
+        # Локальный telegram-bot-api сервер (например http://localhost:8081/bot)
+        # убирает WAN RTT на каждый вызов API; пустое значение — обычный сервер
+        self.BASE_URL = os.getenv('TELEGRAM_BASE_URL')
+        self.BASE_FILE_URL = os.getenv('TELEGRAM_BASE_FILE_URL')
+
+        # Доставка обновлений через вебхук вместо long polling: Telegram
+        # пушит обновления сразу, без интервала getUpdates. Пустой
+        # WEBHOOK_URL оставляет обычный polling.
+        self.WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+        self.WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+        self.WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+        self.WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN')
+
         # Определяем проекты до их использования
         self.PROJECTS = {
             'mf_rf': '🇷🇺 МФ РФ',
@@ -153,14 +248,15 @@ class BotConfig:
             'DEFAULT': '💱'
         }
         
-        # Базовый список администраторов из переменной окружения
-        self.ADMIN_IDS = [int(admin_id) for admin_id in os.getenv('ADMIN_IDS', '').split(',') if admin_id]
-        
-        # Список пользователей финконтроля
-        self.FINCONTROL_IDS = [int(fc_id) for fc_id in os.getenv('FINCONTROL_IDS', '').split(',') if fc_id]
-        
-        # Список администраторов с полным доступом
-        self.ALL_ACCESS_ADMIN_IDS = [int(admin_id) for admin_id in os.getenv('ALL_ACCESS_ADMIN_IDS', '').split(',') if admin_id]
+        # Наборы идентификаторов хранятся как frozenset: проверка
+        # `user_id in ...` выполняется на каждом обновлении
+        self.ADMIN_IDS = frozenset(int(admin_id) for admin_id in os.getenv('ADMIN_IDS', '').split(',') if admin_id)
+
+        # Пользователи финконтроля
+        self.FINCONTROL_IDS = frozenset(int(fc_id) for fc_id in os.getenv('FINCONTROL_IDS', '').split(',') if fc_id)
+
+        # Администраторы с полным доступом
+        self.ALL_ACCESS_ADMIN_IDS = frozenset(int(admin_id) for admin_id in os.getenv('ALL_ACCESS_ADMIN_IDS', '').split(',') if admin_id)
         
         # Маппинг администраторов к источникам
         self.ADMIN_SOURCE_MAPPING = {}
@@ -168,7 +264,7 @@ class BotConfig:
             env_var = f'ADMIN_SOURCE_{source.upper()}'
             admin_ids = os.getenv(env_var, '')
             if admin_ids:
-                self.ADMIN_SOURCE_MAPPING[source] = [int(admin_id) for admin_id in admin_ids.split(',') if admin_id]
+                self.ADMIN_SOURCE_MAPPING[source] = frozenset(int(admin_id) for admin_id in admin_ids.split(',') if admin_id)
         
         # Маппинг администраторов к криптовалютным проектам
         self.ADMIN_CRYPTO_MAPPING = {}
@@ -176,7 +272,7 @@ class BotConfig:
             env_var = f'ADMIN_CRYPTO_{project.upper()}'
             admin_ids = os.getenv(env_var, '')
             if admin_ids:
-                self.ADMIN_CRYPTO_MAPPING[project] = [int(admin_id) for admin_id in admin_ids.split(',') if admin_id]
+                self.ADMIN_CRYPTO_MAPPING[project] = frozenset(int(admin_id) for admin_id in admin_ids.split(',') if admin_id)
         
         # Простая система прав доступа через переменные окружения
         # Возможные значения: "all" - все пользователи, "admins" - только администраторы, "none" - никто
@@ -199,6 +295,90 @@ class BotConfig:
             'Ком-ции. ОНЛАЙН'
         ]
 
+        # Статичные клавиатуры собираются один раз при старте бота:
+        # обработчики пересоздавали одинаковые InlineKeyboardMarkup на
+        # каждом колбэке. Динамическими остаются только клавиатуры,
+        # в callback_data которых входит id заявки.
+        support_row = [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
+        back_row = [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
+
+        project_rows = [
+            [InlineKeyboardButton(project, callback_data=project_id)]
+            for project_id, project in self.PROJECTS.items()
+        ]
+        self.PROJECT_KEYBOARD = InlineKeyboardMarkup(project_rows + [back_row])
+        self.USER_PROJECT_KEYBOARD = InlineKeyboardMarkup(project_rows + [support_row])
+
+        self.CURRENCY_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton(
+                f"{self.CURRENCY_SYMBOLS.get(currency_id, self.CURRENCY_SYMBOLS['DEFAULT'])} {currency}",
+                callback_data=currency_id
+            )]
+            for currency_id, currency in self.CURRENCIES.items()
+        ] + [back_row])
+        self.CURRENCY_PLAIN_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton(currency, callback_data=currency_id)]
+            for currency_id, currency in self.CURRENCIES.items()
+        ] + [back_row])
+
+        source_rows = [
+            [InlineKeyboardButton(source, callback_data=source_id)]
+            for source_id, source in self.SOURCES.items()
+        ]
+        self.SOURCE_KEYBOARD = InlineKeyboardMarkup(source_rows + [back_row])
+        self.SOURCE_PLAIN_KEYBOARD = InlineKeyboardMarkup(source_rows)
+
+        self.NOTE_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton(note, callback_data=f"note_{i}")]
+            for i, note in enumerate(self.NOTES)
+        ] + [
+            [InlineKeyboardButton("📝 Свой вариант", callback_data="custom_note")],
+            back_row
+        ])
+
+        self.FILTER_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton("⏳ Ожидают подтверждения", callback_data="filter_pending")],
+            [InlineKeyboardButton("💰 Одобрено/Ожидают оплаты", callback_data="filter_waiting")],
+            [InlineKeyboardButton("✅ Оплаченные", callback_data="filter_paid")],
+            [InlineKeyboardButton("❌ Отклоненные", callback_data="filter_rejected")],
+            [InlineKeyboardButton("📋 Все заявки", callback_data="filter_all")],
+            back_row
+        ])
+
+        self.DOCUMENT_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton("⏩ Пропустить", callback_data="skip")],
+            back_row
+        ])
+        self.CANCEL_KEYBOARD = InlineKeyboardMarkup(
+            [[InlineKeyboardButton("🔙 Отмена", callback_data="skip")]]
+        )
+
+        self.EXPORT_MENU_KEYBOARD = InlineKeyboardMarkup([
+            [InlineKeyboardButton("📊 Экспорт по заявкам", callback_data="export_requests")],
+            [InlineKeyboardButton("📈 Экспорт по пользователям", callback_data="export_users")],
+            back_row
+        ])
+
+        # Варианты главного меню по ролям
+        create_row = [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")]
+        view_row = [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")]
+        my_requests_row = [InlineKeyboardButton("📋 Мои заявки", callback_data="my_requests")]
+        settings_row = [InlineKeyboardButton("⚙️ Настройки", callback_data="admin_settings")]
+        export_row = [InlineKeyboardButton("📊 Экспорт данных", callback_data="export_data")]
+        self.MAIN_MENU_FULL_KEYBOARD = InlineKeyboardMarkup(
+            [create_row, view_row, settings_row, export_row, support_row])
+        self.MAIN_MENU_ADMIN_KEYBOARD = InlineKeyboardMarkup(
+            [create_row, view_row, export_row, support_row])
+        self.MAIN_MENU_FINCONTROL_KEYBOARD = InlineKeyboardMarkup(
+            [view_row, export_row, support_row])
+        self.MAIN_MENU_USER_KEYBOARD = InlineKeyboardMarkup(
+            [create_row, my_requests_row, support_row])
+        # Исторические варианты возврата в меню (без экспорта/настроек)
+        self.ADMIN_MENU_KEYBOARD = InlineKeyboardMarkup(
+            [create_row, view_row, settings_row, support_row])
+        self.ADMIN_MENU_BASIC_KEYBOARD = InlineKeyboardMarkup(
+            [create_row, view_row, support_row])
+
     def can_access_source(self, user_id: int, source: str, project: str = None) -> bool:
         """Проверяет, имеет ли пользователь доступ к указанному источнику."""
         # Администраторы с полным доступом имеют доступ ко всем источникам
@@ -220,21 +400,142 @@ class BotHandlers:
         'paid': 'Оплачена',
         'rejected': 'Отклонена'
     }
+    # Таблица эмодзи строится один раз на класс, а не на каждый экземпляр
+    status_emoji = {
+        RequestStatus.PENDING: "⏳",
+        RequestStatus.WAITING: "💰",
+        RequestStatus.PAID: "✅",
+        RequestStatus.REJECTED: "❌"
+    }
     def __init__(self, config: BotConfig, db_session):
         self.config = config
         self.db_session = db_session
-        self.status_emoji = {
-            RequestStatus.PENDING: "⏳",
-            RequestStatus.WAITING: "💰",
-            RequestStatus.PAID: "✅",
-            RequestStatus.REJECTED: "❌"
-        }
         # Cache for user info to reduce database queries
         self._user_cache = {}
         # Cache for request details
         self._request_cache = {}
         # Cache timeout in seconds
         self._cache_timeout = 300  # 5 minutes
+        # Кэш готовых ответов на callback-запросы: (user_id, request_id) -> (message, reply_markup)
+        # Короткий TTL, чтобы повторные нажатия не ходили в БД заново
+        self._response_cache = {}
+        self._response_cache_ttl = 5  # seconds
+        # Кэш страниц списка заявок: (user_id, фильтр, страница, размер) ->
+        # (время, (заявки, всего)). Пролистывание туда-обратно не делает
+        # повторных запросов; сбрасывается при любом изменении заявок
+        self._list_cache = {}
+        self._list_cache_ttl = 5  # seconds
+        # TTL деталей заявки короче общего _cache_timeout: детали
+        # регулярно меняются статусами и комментариями
+        self._details_cache_ttl = 10  # seconds
+        # Ссылки на фоновые задачи, чтобы их не собрал GC до завершения
+        self._bg_tasks = set()
+        # Общий семафор исходящих edit/reply: держит темп отправки около
+        # лимита Telegram (30 msg/s) вместо каскада RetryAfter под нагрузкой
+        self._send_sem = asyncio.Semaphore(25)
+        # Пул потоков для синхронных вызовов SQLAlchemy: работа с БД уходит
+        # с событийного цикла, а scoped_session выдаёт каждому потоку свою сессию
+        self._db_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="db")
+        # Диспетчеризация админ-колбэков: точное совпадение ищется одним
+        # обращением к словарю, префиксы — коротким кортежем, вместо
+        # цепочки startswith/split на каждом нажатии
+        self._admin_routes = {
+            "create_request": self.admin_create_request,
+            "view_requests": self.admin_view_requests,
+            "my_requests": self.view_my_requests,
+            "back_to_menu": self.back_to_admin_menu,
+        }
+        self._admin_prefixes = (
+            ("filter_", self._handle_filter),
+            ("prev_page", self._handle_page_navigation),
+            ("next_page", self._handle_page_navigation),
+        )
+
+    async def _run_db(self, fn, *args, **kwargs):
+        """Выполнить синхронный вызов БД в пуле потоков, не блокируя событийный цикл."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, functools.partial(fn, *args, **kwargs))
+
+    def _spawn(self, coro):
+        """Запустить фоновую задачу, удерживая ссылку на неё до завершения."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    def _ack(self, query):
+        """Подтвердить callback-запрос фоновой задачей, не блокируя обработчик.
+
+        Ответ Telegram уходит параллельно с последующей работой с БД —
+        «часики» у пользователя снимаются без ожидания сетевого RTT в
+        начале каждого обработчика. Просроченный callback Telegram
+        отвергает — это не повод ронять обработчик, поэтому ошибка
+        подтверждения только логируется.
+        """
+        self._spawn(self._answer_query(query))
+
+    async def _answer_query(self, query):
+        try:
+            await query.answer()
+        except TelegramError as e:
+            logger.warning("Failed to answer callback query: %s", e)
+
+    async def _safe_edit(self, query, text, **kwargs):
+        """Отредактировать сообщение под общим семафором отправки.
+
+        Семафор удерживает суммарный темп исходящих вызовов ниже лимита
+        Telegram, чтобы всплеск активности не уходил в каскад RetryAfter;
+        сам RetryAfter обрабатывается одним повтором после паузы.
+        """
+        async with self._send_sem:
+            try:
+                return await query.edit_message_text(text, **kwargs)
+            except RetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+                return await query.edit_message_text(text, **kwargs)
+
+    async def _safe_reply(self, message, text, **kwargs):
+        """reply_text под тем же семафором, что и _safe_edit."""
+        async with self._send_sem:
+            try:
+                return await message.reply_text(text, **kwargs)
+            except RetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+                return await message.reply_text(text, **kwargs)
+
+    async def _send_notification(self, bot, sem, chat_id, text):
+        """Отправка одного уведомления под семафором, ошибки не прерывают рассылку."""
+        async with sem:
+            try:
+                await bot.send_message(chat_id=chat_id, text=text)
+            except Exception as e:
+                logger.error("Error notifying chat %s: %s", chat_id, e)
+
+    async def _fanout(self, bot, chat_ids, text):
+        """Параллельная рассылка одинакового сообщения списку чатов.
+
+        asyncio.gather с ограничением в 20 одновременных отправок: N уведомлений
+        уходят за ~1 RTT вместо последовательного цикла send_message.
+        """
+        sem = asyncio.Semaphore(20)
+        await asyncio.gather(*(self._send_notification(bot, sem, chat_id, text) for chat_id in chat_ids))
+
+    async def _download_request_document(self, bot, request_id, file_id, file_name):
+        """Скачивание документа заявки в фоне, без блокировки ответа пользователю."""
+        try:
+            # Создаем директорию для документов заявки
+            request_dir = f"documents/{request_id}"
+            os.makedirs(request_dir, exist_ok=True)
+            file_path = f"{request_dir}/{file_name}"
+
+            # Скачиваем файл
+            file_obj = await bot.get_file(file_id)
+            await file_obj.download_to_drive(file_path)
+
+            # Обновляем путь к файлу в базе данных
+            await self._run_db(update_request, self.db_session, request_id, document_path=file_path)
+        except Exception as e:
+            logger.error("Error downloading document: %s", e)
 
     def _get_cached_user(self, user_id):
         """Get user from cache or database with caching."""
@@ -262,43 +563,71 @@ class BotHandlers:
             self._request_cache[cache_key] = (datetime.now(), request)
         return request
 
-    def _get_main_menu_keyboard(self, user_id: int) -> list:
-        """Generate main menu keyboard based on user role."""
-        keyboard = []
-        
-        # Check if user has full access
+    async def _get_request_details_cached(self, request_id):
+        """Заявка с комментариями, с коротким кэшем на повторные открытия.
+
+        Хождение по списку туда-обратно не перечитывает одну и ту же
+        заявку из БД; TTL короткий, а при изменениях запись вычищается
+        через _invalidate_request_responses.
+        """
+        cache_key = f"details_{request_id}"
+        if cache_key in self._request_cache:
+            cache_time, request = self._request_cache[cache_key]
+            if (datetime.now() - cache_time).total_seconds() < self._details_cache_ttl:
+                return request
+
+        request = await self._run_db(get_request_with_details, self.db_session, request_id)
+        if request:
+            self._request_cache[cache_key] = (datetime.now(), request)
+        return request
+
+    def _get_cached_response(self, cache_key):
+        """Get rendered callback response from cache if still fresh."""
+        if cache_key in self._response_cache:
+            cache_time, response = self._response_cache[cache_key]
+            if (datetime.now() - cache_time).total_seconds() < self._response_cache_ttl:
+                return response
+        return None
+
+    def _store_response(self, cache_key, response):
+        """Store rendered callback response in cache."""
+        self._response_cache[cache_key] = (datetime.now(), response)
+
+    def _invalidate_request_responses(self, request_id):
+        """Drop cached responses for a request after its data changed."""
+        stale = [key for key in self._response_cache if key[1] == request_id]
+        for key in stale:
+            del self._response_cache[key]
+        # Кэшированные копии заявки устарели вместе с ответами
+        self._request_cache.pop(f"request_{request_id}", None)
+        self._request_cache.pop(f"details_{request_id}", None)
+        # Списки содержат изменившуюся заявку — сбрасываем кэш страниц
+        self._list_cache.clear()
+
+    async def _get_requests_for_user_cached(self, user_id, status_filter=None, page=0, page_size=5):
+        """Страница списка заявок с коротким TTL-кэшем для пролистывания."""
+        key = (user_id, status_filter, page, page_size)
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            cache_time, value = cached
+            if (datetime.now() - cache_time).total_seconds() < self._list_cache_ttl:
+                return value
+        value = await self._run_db(self._get_requests_for_user, user_id, status_filter, page, page_size)
+        if len(self._list_cache) > 256:
+            self._list_cache.clear()
+        self._list_cache[key] = (datetime.now(), value)
+        return value
+
+    def _get_main_menu_keyboard(self, user_id: int) -> InlineKeyboardMarkup:
+        """Return prebuilt main menu keyboard based on user role."""
         if user_id in self.config.ALL_ACCESS_ADMIN_IDS:
-            keyboard = [
-                [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")],
-                [InlineKeyboardButton("⚙️ Настройки", callback_data="admin_settings")],
-                [InlineKeyboardButton("📊 Экспорт данных", callback_data="export_data")],
-                [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-            ]
-        # Check if user is admin
+            return self.config.MAIN_MENU_FULL_KEYBOARD
         elif user_id in self.config.ADMIN_IDS:
-            keyboard = [
-                [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")],
-                [InlineKeyboardButton("📊 Экспорт данных", callback_data="export_data")],
-                [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-            ]
-        # Check if user is in fincontrol group
+            return self.config.MAIN_MENU_ADMIN_KEYBOARD
         elif user_id in self.config.FINCONTROL_IDS:
-            keyboard = [
-                [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")],
-                [InlineKeyboardButton("📊 Экспорт данных", callback_data="export_data")],
-                [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-            ]
-        # Regular user
+            return self.config.MAIN_MENU_FINCONTROL_KEYBOARD
         else:
-            keyboard = [
-                [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                [InlineKeyboardButton("📋 Мои заявки", callback_data="my_requests")],
-                [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-            ]
-        
-        return keyboard
+            return self.config.MAIN_MENU_USER_KEYBOARD
 
     def _get_main_menu_message(self, user_id: int) -> str:
         """Generate main menu message based on user role."""
@@ -317,18 +646,16 @@ class BotHandlers:
             user_id = update.effective_user.id
             
             # Get keyboard and message based on user role
-            keyboard = self._get_main_menu_keyboard(user_id)
+            reply_markup = self._get_main_menu_keyboard(user_id)
             default_message = self._get_main_menu_message(user_id)
             
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
             if update.callback_query:
-                await update.callback_query.edit_message_text(
+                await self._safe_edit(update.callback_query, 
                     message or default_message,
                     reply_markup=reply_markup
                 )
             else:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     message or default_message,
                     reply_markup=reply_markup
                 )
@@ -336,7 +663,7 @@ class BotHandlers:
             return ADMIN_MENU
             
         except Exception as e:
-            logger.error(f"Error in _show_main_menu: {e}")
+            logger.error("Error in _show_main_menu: %s", e)
             if update.callback_query:
                 await self._handle_error(update.callback_query, "showing main menu")
             return ADMIN_MENU
@@ -344,7 +671,8 @@ class BotHandlers:
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Start the conversation and ask for project selection."""
         try:
-            user = get_or_create_user(
+            user = await self._run_db(
+                get_or_create_user,
                 self.db_session,
                 update.effective_user.id,
                 update.effective_user.username
@@ -353,8 +681,8 @@ class BotHandlers:
             return await self._show_main_menu(update, context)
 
         except Exception as e:
-            logger.error(f"Error in start command: {e}")
-            await update.message.reply_text(
+            logger.error("Error in start command: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при запуске бота. Пожалуйста, попробуйте позже или обратитесь в техподдержку @butterglobe"
             )
             return ConversationHandler.END
@@ -363,71 +691,62 @@ class BotHandlers:
         """Обработчик всех кнопок в админ-меню."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
-            logger.info(f"Admin callback received: {query.data}")
+            data = query.data
+            logger.info("Admin callback received: %s", data)
 
-            # Маршрутизация запросов на основе callback data
-            if query.data == "create_request":
-                return await self.admin_create_request(query, context)
-            elif query.data == "view_requests":
-                return await self.admin_view_requests(query, context)
-            elif query.data == "my_requests":
-                return await self.view_my_requests(query, context)
-            elif query.data == "admin_settings":
-                # Проверяем права доступа
+            # Точные совпадения — один поиск в словаре маршрутов
+            handler = self._admin_routes.get(data)
+            if handler is not None:
+                return await handler(query, context)
+
+            # Ветки с проверкой прав доступа
+            if data == "admin_settings":
                 if update.effective_user.id not in self.config.ALL_ACCESS_ADMIN_IDS:
                     await query.answer("У вас нет прав для доступа к настройкам", show_alert=True)
                     return ADMIN_MENU
                 return await self.admin_settings(query, context)
-            elif query.data == "export_data":
-                # Проверяем права доступа
-                if not (update.effective_user.id in self.config.ADMIN_IDS or 
-                       update.effective_user.id in self.config.FINCONTROL_IDS or 
+            elif data == "export_data":
+                if not (update.effective_user.id in self.config.ADMIN_IDS or
+                       update.effective_user.id in self.config.FINCONTROL_IDS or
                        update.effective_user.id in self.config.ALL_ACCESS_ADMIN_IDS):
                     await query.answer("У вас нет прав для экспорта данных", show_alert=True)
                     return ADMIN_MENU
                 return await self.handle_export_data(update, context)
-            elif query.data.startswith("export_requests") or query.data.startswith("export_users"):
+            elif data.startswith("export_requests") or data.startswith("export_users"):
                 return await self.handle_export_format(update, context)
-            elif query.data.endswith("_excel") or query.data.endswith("_csv"):
+            elif data.endswith("_excel") or data.endswith("_csv"):
                 return await self.process_export(update, context)
-            elif query.data.startswith("setting_"):
+            elif data.startswith("setting_"):
                 return await self.handle_settings_option(query, context)
-            elif query.data == "back_to_menu":
-                return await self._show_main_menu(Update(update_id=0, callback_query=query), context)
-            elif query.data.startswith("filter_"):
-                return await self._handle_filter(query, context)
-            elif query.data in ["prev_page", "next_page"]:
-                return await self._handle_page_navigation(query, context)
-            elif query.data.startswith("request_"):
+
+            # Префиксные маршруты (фильтры, пагинация)
+            for prefix, handler in self._admin_prefixes:
+                if data.startswith(prefix):
+                    return await handler(query, context)
+
+            if data.startswith("request_"):
                 # Обработка нажатия на заявку в списке
-                request_id = int(query.data.split('_')[1])
+                request_id = int(data.rpartition('_')[2])
                 return await self.view_request_details_by_id(update, context, request_id)
-            else:
-                logger.warning(f"Unhandled admin callback: {query.data}")
-                return ADMIN_MENU
+
+            logger.warning("Unhandled admin callback: %s", data)
+            return ADMIN_MENU
 
         except Exception as e:
-            logger.error(f"Error in handle_admin_callback: {e}")
+            logger.error("Error in handle_admin_callback: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "admin callback")
             return ADMIN_MENU
 
     async def admin_create_request(self, query, context) -> int:
         """Обработка создания заявки администратором."""
-        keyboard = [
-            [InlineKeyboardButton(project, callback_data=project_id)]
-            for project_id, project in self.config.PROJECTS.items()
-        ]
-        keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        await query.edit_message_text(
+        await self._safe_edit(query, 
             "📝 Выберите проект для новой заявки:",
-            reply_markup=reply_markup
+            reply_markup=self.config.PROJECT_KEYBOARD
         )
-        logger.info(f"Admin creating new request, showing project selection")
+        logger.info("Admin creating new request, showing project selection")
         return CHOOSING_PROJECT
 
     async def admin_view_requests(self, query, context) -> int:
@@ -437,20 +756,10 @@ class BotHandlers:
         context.user_data['request_filter'] = None
         context.user_data['request_page'] = 0
 
-        keyboard = [
-            [InlineKeyboardButton("⏳ Ожидают подтверждения", callback_data="filter_pending")],
-            [InlineKeyboardButton("💰 Одобрено/Ожидают оплаты", callback_data="filter_waiting")],
-            [InlineKeyboardButton("✅ Оплаченные", callback_data="filter_paid")],
-            [InlineKeyboardButton("❌ Отклоненные", callback_data="filter_rejected")],
-            [InlineKeyboardButton("📋 Все заявки", callback_data="filter_all")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         logger.info("Showing request filter keyboard")
-        await query.edit_message_text(
+        await self._safe_edit(query, 
             "Выберите категорию заявок для просмотра (либо отправьте id заявки в чате):",
-            reply_markup=reply_markup
+            reply_markup=self.config.FILTER_KEYBOARD
         )
         return VIEWING_REQUESTS
 
@@ -501,13 +810,13 @@ class BotHandlers:
 
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        await query.edit_message_text(
+        await self._safe_edit(query, 
             "⚙️ Настройки администратора\n\n"
             "Текущие права доступа:",
             reply_markup=reply_markup
         )
 
-        logger.info(f"Admin settings displayed for user {user_id}")
+        logger.info("Admin settings displayed for user %s", user_id)
         return ADMIN_MENU
 
     async def handle_settings_option(self, query, context) -> int:
@@ -527,7 +836,7 @@ class BotHandlers:
             return await self.admin_settings(query, context)
 
         except Exception as e:
-            logger.error(f"Error in handle_settings_option: {e}")
+            logger.error("Error in handle_settings_option: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "settings update")
             return ADMIN_MENU
@@ -540,58 +849,35 @@ class BotHandlers:
         """Handle project selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Обработка кнопки "Назад"
             if query.data == "back_to_menu":
                 # Проверяем, является ли пользователь администратором
                 if update.effective_user.id in self.config.ADMIN_IDS:
-                    keyboard = [
-                        [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                        [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")],
-                        [InlineKeyboardButton("⚙️ Настройки", callback_data="admin_settings")],
-                        [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "👋 Панель администратора. Выберите действие:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.ADMIN_MENU_KEYBOARD
                     )
                 else:
-                    keyboard = [
-                        [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                        [InlineKeyboardButton("📋 Мои заявки", callback_data="my_requests")],
-                        [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "👋 Добро пожаловать! Выберите действие:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.MAIN_MENU_USER_KEYBOARD
                     )
                 return ADMIN_MENU
 
             project_id = query.data
             context.user_data['project'] = project_id
 
-            # Create keyboard for currency selection with emojis
-            keyboard = []
-            for currency_id, currency in self.config.CURRENCIES.items():
-                symbol = self.config.CURRENCY_SYMBOLS.get(currency_id, self.config.CURRENCY_SYMBOLS['DEFAULT'])
-                button_text = f"{symbol} {currency}"
-                keyboard.append([InlineKeyboardButton(button_text, callback_data=currency_id)])
-            
-            keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"Выбран проект: {self.config.PROJECTS[project_id]}\n\n"
                 "Выберите валюту:",
-                reply_markup=reply_markup
+                reply_markup=self.config.CURRENCY_KEYBOARD
             )
             return CHOOSING_CURRENCY
 
         except Exception as e:
-            logger.error(f"Error in project_selected: {e}")
+            logger.error("Error in project_selected: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "project selection")
             return ConversationHandler.END
@@ -600,7 +886,7 @@ class BotHandlers:
         """Handle currency selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Обработка кнопки "Назад"
             if query.data == "back_to_menu":
@@ -608,29 +894,22 @@ class BotHandlers:
                     return await self.back_to_admin_menu(query, context)
                 else:
                     # Для обычных пользователей - возврат к выбору проекта
-                    keyboard = [
-                        [InlineKeyboardButton(project, callback_data=project_id)]
-                        for project_id, project in self.config.PROJECTS.items()
-                    ]
-                    keyboard.append([InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")])
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "👋 Выберите проект:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.USER_PROJECT_KEYBOARD
                     )
                     return CHOOSING_PROJECT
 
             currency_id = query.data
             context.user_data['currency'] = currency_id      # Ask for amount
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"Выбрана валюта: {self.config.CURRENCIES[currency_id]}\n\n"
                 "Введите сумму (только цифры):"
             )
             return ENTERING_AMOUNT
 
         except Exception as e:
-            logger.error(f"Error in currency_selected: {e}")
+            logger.error("Error in currency_selected: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "currency selection")
             return ConversationHandler.END
@@ -644,36 +923,22 @@ class BotHandlers:
                 amount = validate_amount(amount_text)
                 context.user_data['amount'] = amount
 
-                # Create keyboard for source selection with emojis
-                keyboard = []
-                for source_id, source in self.config.SOURCES.items():
-                    if 'crypto' in source_id.lower():
-                        button_text = f"{source}"
-                    elif 'bank' in source_id.lower():
-                        button_text = f"{source}"
-                    else:
-                        button_text = f"{source}"
-                    keyboard.append([InlineKeyboardButton(button_text, callback_data=source_id)])
-                
-                keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-                reply_markup = InlineKeyboardMarkup(keyboard)
-
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"Сумма: {amount}{self.config.CURRENCIES[context.user_data['currency']]}\n\n"
                     "Выберите источник средств:",
-                    reply_markup=reply_markup
+                    reply_markup=self.config.SOURCE_KEYBOARD
                 )
                 return CHOOSING_SOURCE
 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return ENTERING_AMOUNT
 
         except Exception as e:
-            logger.error(f"Error in amount_entered: {e}")
-            await update.message.reply_text(
+            logger.error("Error in amount_entered: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при обработке суммы. Пожалуйста, попробуйте еще раз."
             )
             return ENTERING_AMOUNT
@@ -682,7 +947,7 @@ class BotHandlers:
         """Handle source selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Обработка кнопки "Назад"
             if query.data == "back_to_menu":
@@ -690,16 +955,9 @@ class BotHandlers:
                     return await self.back_to_admin_menu(query, context)
                 else:
                     # Возврат к выбору валюты
-                    keyboard = [
-                        [InlineKeyboardButton(currency, callback_data=currency_id)]
-                        for currency_id, currency in self.config.CURRENCIES.items()
-                    ]
-                    keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         f"Выберите валюту:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.CURRENCY_PLAIN_KEYBOARD
                     )
                     return CHOOSING_CURRENCY
 
@@ -707,22 +965,16 @@ class BotHandlers:
             context.user_data['source'] = source_id
 
             # Сразу переходим к запросу документа
-            keyboard = [
-                [InlineKeyboardButton("⏩ Пропустить", callback_data="skip")],
-                [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"Выбран источник: {self.config.SOURCES[source_id]}\n\n"
                 "Пожалуйста, отправьте документ (чек или квитанцию):\n"
                 "(или нажмите «Пропустить», если документа нет)",
-                reply_markup=reply_markup
+                reply_markup=self.config.DOCUMENT_KEYBOARD
             )
             return ATTACHING_DOCUMENT
 
         except Exception as e:
-            logger.error(f"Error in source_selected: {e}")
+            logger.error("Error in source_selected: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "source selection")
             return ConversationHandler.END
@@ -732,27 +984,18 @@ class BotHandlers:
         try:
             if update.callback_query:
                 query = update.callback_query
-                await query.answer()
+                self._ack(query)
 
                 if query.data == "skip":
-                    # Create keyboard for note selection
-                    keyboard = [
-                        [InlineKeyboardButton(note, callback_data=f"note_{i}")]
-                        for i, note in enumerate(self.config.NOTES)
-                    ]
-                    keyboard.append([InlineKeyboardButton("📝 Свой вариант", callback_data="custom_note")])
-                    keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Выберите примечание или введите свой вариант:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.NOTE_KEYBOARD
                     )
                     return ENTERING_NOTE
 
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "Отправьте документ или фото:",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data="skip")]])
+                    reply_markup=self.config.CANCEL_KEYBOARD
                 )
                 return ATTACHING_DOCUMENT
 
@@ -764,9 +1007,9 @@ class BotHandlers:
                 file = update.message.photo[-1]  # Get the largest photo
                 file_name = f"photo_{file.file_id}.jpg"
             else:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Пожалуйста, отправьте документ или фото.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data="skip")]])
+                    reply_markup=self.config.CANCEL_KEYBOARD
                 )
                 return ATTACHING_DOCUMENT
 
@@ -776,28 +1019,19 @@ class BotHandlers:
                 'file_name': file_name
             }
 
-            # Create keyboard for note selection
-            keyboard = [
-                [InlineKeyboardButton(note, callback_data=f"note_{i}")]
-                for i, note in enumerate(self.config.NOTES)
-            ]
-            keyboard.append([InlineKeyboardButton("📝 Свой вариант", callback_data="custom_note")])
-            keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await update.message.reply_text(
+            await self._safe_reply(update.message, 
                 "Документ прикреплен. Выберите примечание или введите свой вариант:",
-                reply_markup=reply_markup
+                reply_markup=self.config.NOTE_KEYBOARD
             )
             return ENTERING_NOTE
 
         except Exception as e:
-            logger.error(f"Error in handle_document: {e}")
+            logger.error("Error in handle_document: %s", e)
             if update.callback_query:
                 query = update.callback_query
                 await self._handle_error(query, "document attachment")
             else:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Произошла ошибка при прикреплении документа. Пожалуйста, попробуйте позже."
                 )
             return ATTACHING_DOCUMENT
@@ -806,33 +1040,27 @@ class BotHandlers:
         """Handle partner account selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             if query.data == "back_to_menu":
                 if update.effective_user.id in self.config.ADMIN_IDS:
                     return await self.back_to_admin_menu(query, context)
                 else:
                     # Return to source selection
-                    keyboard = [
-                        [InlineKeyboardButton(source, callback_data=source_id)]
-                        for source_id, source in self.config.SOURCES.items()
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Выберите источник средств:",
-                        reply_markup=reply_markup
+                        reply_markup=self.config.SOURCE_PLAIN_KEYBOARD
                     )
                     return CHOOSING_SOURCE
 
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 "Введите счет партнера:",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data="skip")]])
+                reply_markup=self.config.CANCEL_KEYBOARD
             )
             return ENTERING_PARTNER_ACCOUNT
 
         except Exception as e:
-            logger.error(f"Error in handle_partner_account: {e}")
+            logger.error("Error in handle_partner_account: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "partner account selection")
             return ATTACHING_DOCUMENT
@@ -855,7 +1083,7 @@ class BotHandlers:
                 keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"Счет партнера: {partner_account}\n\n"
                     "Выберите примечание или введите свой вариант:",
                     reply_markup=reply_markup
@@ -863,14 +1091,14 @@ class BotHandlers:
                 return ENTERING_NOTE
 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return ENTERING_PARTNER_ACCOUNT
 
         except Exception as e:
-            logger.error(f"Error in handle_partner_account_input: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_partner_account_input: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при обработке счета партнера. Пожалуйста, попробуйте еще раз."
             )
             return ENTERING_PARTNER_ACCOUNT
@@ -879,7 +1107,7 @@ class BotHandlers:
         """Handle note selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             if query.data == "back_to_menu":
                 if update.effective_user.id in self.config.ADMIN_IDS:
@@ -894,20 +1122,20 @@ class BotHandlers:
                     ]
                     reply_markup = InlineKeyboardMarkup(keyboard)
 
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Выберите действие:",
                         reply_markup=reply_markup
                     )
                     return ATTACHING_DOCUMENT
 
             if query.data == "custom_note":
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "Введите ваше примечание:",
                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data="back_to_menu")]])
                 )
                 return ENTERING_NOTE
 
-            note_index = int(query.data.split('_')[1])
+            note_index = int(query.data.partition('_')[2])
             note = self.config.NOTES[note_index]
             context.user_data['note'] = note
 
@@ -921,7 +1149,7 @@ class BotHandlers:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"Примечание: {note}\n\n"
                 "Выберите периодичность:",
                 reply_markup=reply_markup
@@ -929,7 +1157,7 @@ class BotHandlers:
             return CHOOSING_PERIOD
 
         except Exception as e:
-            logger.error(f"Error in handle_note: {e}")
+            logger.error("Error in handle_note: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "note selection")
             return ENTERING_NOTE
@@ -953,7 +1181,7 @@ class BotHandlers:
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"Примечание: {note}\n\n"
                     "Выберите периодичность:",
                     reply_markup=reply_markup
@@ -961,14 +1189,14 @@ class BotHandlers:
                 return CHOOSING_PERIOD
 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return ENTERING_NOTE
 
         except Exception as e:
-            logger.error(f"Error in handle_custom_note: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_custom_note: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при обработке примечания. Пожалуйста, попробуйте еще раз."
             )
             return ENTERING_NOTE
@@ -977,7 +1205,7 @@ class BotHandlers:
         """Handle period selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             if query.data == "back_to_menu":
                 if update.effective_user.id in self.config.ADMIN_IDS:
@@ -992,14 +1220,14 @@ class BotHandlers:
                     keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
                     reply_markup = InlineKeyboardMarkup(keyboard)
 
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Выберите примечание или введите свой вариант:",
                         reply_markup=reply_markup
                     )
                     return ENTERING_NOTE
 
             if query.data == "custom_period":
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "Введите свой вариант периодичности:",
                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data="back_to_menu")]])
                 )
@@ -1025,7 +1253,7 @@ class BotHandlers:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"Периодичность: {period}\n\n"
                 "Укажите дату или период в формате ДД.ММ.ГГГГ или ДД.ММ.ГГГГ - ДД.ММ.ГГГГ:\n"
                 "(или выберите сегодняшнюю дату кнопкой ниже)",
@@ -1034,7 +1262,7 @@ class BotHandlers:
             return CHOOSING_DATE
 
         except Exception as e:
-            logger.error(f"Error in handle_period: {e}")
+            logger.error("Error in handle_period: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "period selection")
             return CHOOSING_PERIOD
@@ -1057,7 +1285,7 @@ class BotHandlers:
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"Период: {period}\n\n"
                     "Выберите дату:",
                     reply_markup=reply_markup
@@ -1065,14 +1293,14 @@ class BotHandlers:
                 return CHOOSING_DATE
 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return CHOOSING_PERIOD
 
         except Exception as e:
-            logger.error(f"Error in handle_period_input: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_period_input: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при обработке периода. Пожалуйста, попробуйте еще раз."
             )
             return CHOOSING_PERIOD
@@ -1083,7 +1311,7 @@ class BotHandlers:
             # Check if this is a callback query (button press) or text input
             if update.callback_query:
                 query = update.callback_query
-                await query.answer()
+                self._ack(query)
                 
                 if query.data.startswith("date_"):
                     # Extract date from callback data (format: date_DD.MM.YYYY)
@@ -1122,13 +1350,13 @@ class BotHandlers:
                         ]
                         reply_markup = InlineKeyboardMarkup(keyboard)
 
-                        await query.edit_message_text(
+                        await self._safe_edit(query, 
                             summary,
                             reply_markup=reply_markup
                         )
                         return CONFIRMING_REQUEST
                     except ValueError as e:
-                        await query.edit_message_text(
+                        await self._safe_edit(query, 
                             f"❌ {str(e)}",
                             reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]])
                         )
@@ -1171,24 +1399,24 @@ class BotHandlers:
                     ]
                     reply_markup = InlineKeyboardMarkup(keyboard)
 
-                    await update.message.reply_text(
+                    await self._safe_reply(update.message, 
                         summary,
                         reply_markup=reply_markup
                     )
                     return CONFIRMING_REQUEST
                 except ValueError as e:
-                    await update.message.reply_text(
+                    await self._safe_reply(update.message, 
                         f"❌ {str(e)}"
                     )
                     return CHOOSING_DATE
 
         except Exception as e:
-            logger.error(f"Error in handle_date: {e}")
+            logger.error("Error in handle_date: %s", e)
             if update.callback_query:
                 query = update.callback_query
                 await self._handle_error(query, "date input")
             else:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Произошла ошибка при обработке даты. Пожалуйста, попробуйте еще раз."
                 )
             return CHOOSING_DATE
@@ -1197,10 +1425,10 @@ class BotHandlers:
         """Handle request confirmation."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             if query.data == "cancel":
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "❌ Заявка отменена. Для создания новой заявки используйте /start"
                 )
                 return ConversationHandler.END
@@ -1234,32 +1462,32 @@ class BotHandlers:
                     request_data['note'] = "\n".join(note_additions)
 
             # Создаем заявку в базе данных
-            request = create_request(self.db_session, **request_data)
+            request = await self._run_db(create_request, self.db_session, **request_data)
+            self._list_cache.clear()
 
             # Логируем создание заявки
             self._log_request_creation(request.id, update.effective_user.id, request_data)
 
-            # Если есть документ, скачиваем его в папку заявки
+            # Уведомляем администраторов о новой заявке одной параллельной рассылкой
+            admin_ids = [aid for aid in self.config.ADMIN_IDS if aid != update.effective_user.id]
+            if admin_ids:
+                self._spawn(self._fanout(
+                    context.bot,
+                    admin_ids,
+                    f"🔔 Создана новая заявка #{request.id}: "
+                    f"{self.config.PROJECTS.get(request_data['project'], request_data['project'])}, "
+                    f"{request_data['amount']} {request_data['currency']}"
+                ))
+
+            # Если есть документ, скачиваем его в фоне: пользователь получает
+            # подтверждение сразу, не дожидаясь загрузки большого файла
             if 'document' in context.user_data:
-                try:
-                    # Создаем директорию для документов заявки
-                    request_dir = f"documents/{request.id}"
-                    os.makedirs(request_dir, exist_ok=True)
-
-                    # Получаем информацию о файле
-                    file_id = context.user_data['document']['file_id']
-                    file_name = context.user_data['document']['file_name']
-                    file_path = f"{request_dir}/{file_name}"
-
-                    # Скачиваем файл
-                    file_obj = await context.bot.get_file(file_id)
-                    await file_obj.download_to_drive(file_path)
-
-                    # Обновляем путь к файлу в базе данных
-                    update_request(self.db_session, request.id, document_path=file_path)
-                except Exception as e:
-                    logger.error(f"Error downloading document: {e}")
-                    # Продолжаем выполнение даже если не удалось скачать файл
+                self._spawn(self._download_request_document(
+                    context.bot,
+                    request.id,
+                    context.user_data['document']['file_id'],
+                    context.user_data['document']['file_name']
+                ))
 
             # Check if user is admin
             if update.effective_user.id in self.config.ADMIN_IDS:
@@ -1271,7 +1499,7 @@ class BotHandlers:
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     f"✅ Заявка #{request.id} успешно создана!\n\n"
                     "Выберите действие:",
                     reply_markup=reply_markup
@@ -1279,7 +1507,7 @@ class BotHandlers:
                 return ADMIN_MENU
             else:
                 # Regular user
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     f"✅ Заявка #{request.id} успешно создана!\n\n"
                     "Вы получите уведомление при изменении статуса заявки.\n\n"
                     "Для создания новой заявки используйте /start"
@@ -1287,7 +1515,7 @@ class BotHandlers:
                 return ConversationHandler.END
 
         except Exception as e:
-            logger.error(f"Error in confirm_request: {e}")
+            logger.error("Error in confirm_request: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "request confirmation")
             return CONFIRMING_REQUEST
@@ -1333,7 +1561,7 @@ class BotHandlers:
             return requests, total
             
         except Exception as e:
-            logger.error(f"Error in _get_requests_for_user: {e}")
+            logger.error("Error in _get_requests_for_user: %s", e)
             return [], 0
 
     async def _show_filter_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -1352,12 +1580,12 @@ class BotHandlers:
             reply_markup = InlineKeyboardMarkup(keyboard)
             
             if update.callback_query:
-                await update.callback_query.edit_message_text(
+                await self._safe_edit(update.callback_query, 
                     "Выберите категорию заявок для просмотра (либо отправьте id заявки в чате):",
                     reply_markup=reply_markup
                 )
             else:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "Выберите категорию заявок для просмотра (либо отправьте id заявки в чат):",
                     reply_markup=reply_markup
                 )
@@ -1365,7 +1593,7 @@ class BotHandlers:
             return VIEWING_REQUESTS
             
         except Exception as e:
-            logger.error(f"Error in _show_filter_menu: {e}")
+            logger.error("Error in _show_filter_menu: %s", e)
             if update.callback_query:
                 await self._handle_error(update.callback_query, "showing filter menu")
             return VIEWING_REQUESTS
@@ -1382,28 +1610,31 @@ class BotHandlers:
                 await query.answer("У вас нет прав для просмотра всех заявок", show_alert=True)
                 return await self.view_my_requests(query, context)
             
-            filter_type = query.data.split('_')[1]
+            filter_type = query.data.partition('_')[2]
             context.user_data['request_filter'] = filter_type
             context.user_data['request_page'] = 0
 
-            logger.info(f"Filtering requests by: {filter_type}")
+            logger.info("Filtering requests by: %s", filter_type)
 
-            status_filter = None
-            if filter_type != "all":
-                status_filter = getattr(RequestStatus, filter_type.upper(), None)
+            status_filter = _FILTER_TO_STATUS.get(filter_type)
 
             # Получаем заявки с учетом прав доступа
-            requests, total = self._get_requests_for_user(user_id, status_filter, 0, 5)
+            requests, total = await self._get_requests_for_user_cached(user_id, status_filter, 0, 5)
             total_pages = (total + 5 - 1) // 5
 
-            message, keyboard = self._create_request_list_message(requests, context)
+            message, keyboard = await self._run_db(self._create_request_list_message, requests, context)
             message += f"\nСтраница 1 из {total_pages} | Всего заявок: {total}"
 
-            await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await self._safe_edit(query, message, reply_markup=InlineKeyboardMarkup(keyboard))
+
+            # Подогреваем следующую страницу в фоне: к моменту нажатия
+            # «След.» результат уже лежит в _list_cache
+            if total_pages > 1:
+                self._spawn(self._get_requests_for_user_cached(user_id, status_filter, 1, 5))
             return VIEWING_REQUESTS
             
         except Exception as e:
-            logger.error(f"Error in _handle_filter: {e}")
+            logger.error("Error in _handle_filter: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "filtering requests")
             return ADMIN_MENU
@@ -1430,21 +1661,23 @@ class BotHandlers:
             context.user_data['request_page'] = page
 
             filter_type = context.user_data.get('request_filter')
-            status_filter = None
-            if filter_type and filter_type != "all":
-                status_filter = getattr(RequestStatus, filter_type.upper(), None)
+            status_filter = _FILTER_TO_STATUS.get(filter_type)
 
             # Получаем заявки с учетом прав доступа
-            requests, total = self._get_requests_for_user(user_id, status_filter, page, 5)
+            requests, total = await self._get_requests_for_user_cached(user_id, status_filter, page, 5)
             total_pages = (total + 5 - 1) // 5
 
-            message, keyboard = self._create_request_list_message(requests, context)
+            message, keyboard = await self._run_db(self._create_request_list_message, requests, context)
             message += f"\nСтраница {page+1} из {total_pages} | Всего заявок: {total}"
-            await query.edit_message_text(message, reply_markup=InlineKeyboardMarkup(keyboard))
+            await self._safe_edit(query, message, reply_markup=InlineKeyboardMarkup(keyboard))
+
+            # Префетч следующей страницы, пока пользователь читает текущую
+            if page + 1 < total_pages:
+                self._spawn(self._get_requests_for_user_cached(user_id, status_filter, page + 1, 5))
             return VIEWING_REQUESTS
             
         except Exception as e:
-            logger.error(f"Error in _handle_page_navigation: {e}")
+            logger.error("Error in _handle_page_navigation: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "page navigation")
             return ADMIN_MENU
@@ -1452,51 +1685,17 @@ class BotHandlers:
     async def _handle_back_to_menu(self, query):
         """Handle back to menu action."""
         try:
-            keyboard = [
-                [InlineKeyboardButton("📝 Создать заявку", callback_data="create_request")],
-                [InlineKeyboardButton("📋 Просмотр заявок", callback_data="view_requests")],
-                [InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 "👋 Панель администратора. Выберите действие:",
-                reply_markup=reply_markup
+                reply_markup=self.config.ADMIN_MENU_BASIC_KEYBOARD
             )
             return ADMIN_MENU
         except Exception as e:
-            logger.error(f"Error in _handle_back_to_menu: {e}")
+            logger.error("Error in _handle_back_to_menu: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "back to menu")
             return ADMIN_MENU
 
-    def _format_user_info(self, user):
-        """Format user information for display.
-        
-        Priority order:
-        1. First name (if available)
-        2. Username (if available)
-        3. Telegram ID (if available)
-        4. User ID (as last resort)
-        """
-        if not user:
-            return "Неизвестный пользователь"
-            
-        # Сначала проверяем имя
-        if hasattr(user, 'first_name') and user.first_name:
-            return user.first_name
-        
-        # Затем проверяем username
-        if hasattr(user, 'username') and user.username:
-            return f"@{user.username}"
-        
-        # Если есть telegram_id, используем его
-        if hasattr(user, 'telegram_id'):
-            return f"user_{user.telegram_id}"
-        
-        # В последнюю очередь используем id
-        return f"user_{user.id}"
-
     def _create_request_list_message(self, requests, context):
         """Create message and keyboard for request list."""
         if not requests:
@@ -1505,15 +1704,11 @@ class BotHandlers:
             return message, keyboard
 
         filter_type = context.user_data.get('request_filter', 'all')
-        filter_name = {
-            'pending': '⏳ Ожидают подтверждения',
-            'waiting': '💰 Одобрено/Ожидают оплаты',
-            'paid': '✅ Оплаченные',
-            'rejected': '❌ Отклоненные',
-            'all': '📋 Все заявки'
-        }.get(filter_type, '📋 Заявки')
+        filter_name = _FILTER_TITLES.get(filter_type, '📋 Заявки')
 
-        message = f"{filter_name}:\n\n"
+        # Сообщение собирается списком с одним join в конце: конкатенация
+        # строк в цикле копирует растущий буфер на каждой итерации
+        parts = [f"{filter_name}:\n\n"]
 
         for req in requests:
             emoji = self.status_emoji.get(req.status, "")
@@ -1524,10 +1719,14 @@ class BotHandlers:
             currency_name = self.config.CURRENCIES.get(req.currency, req.currency)
             currency_symbol = self.config.CURRENCY_SYMBOLS.get(req.currency, self.config.CURRENCY_SYMBOLS['DEFAULT'])
             
-            message += f"{emoji} #{req.id} - {self.config.PROJECTS[req.project]} - "
-            message += f"{req.amount} {currency_symbol} {currency_name} - {user_info}\n"
-            message += f"Создано: {(req.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')}  "
-            message += f"Изменено: {(req.updated_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')}\n\n"
+            parts.append(
+                f"{emoji} #{req.id} - {self.config.PROJECTS[req.project]} - "
+                f"{req.amount} {currency_symbol} {currency_name} - {user_info}\n"
+                f"Создано: {_format_dt(req.created_at + timedelta(hours=timeDelta))}  "
+                f"Изменено: {_format_dt(req.updated_at + timedelta(hours=timeDelta))}\n\n"
+            )
+
+        message = "".join(parts)
 
         keyboard = []
         for req in requests:
@@ -1548,9 +1747,7 @@ class BotHandlers:
 
         # Получаем общее количество заявок для расчета общего количества страниц
         filter_type = context.user_data.get('request_filter')
-        status_filter = None
-        if filter_type and filter_type != "all":
-            status_filter = getattr(RequestStatus, filter_type.upper(), None)
+        status_filter = _FILTER_TO_STATUS.get(filter_type)
 
         # Получаем общее количество заявок
         _, total = get_requests_paginated(self.db_session, status=status_filter, page=0, page_size=1)
@@ -1569,23 +1766,45 @@ class BotHandlers:
 
     def _format_request_details(self, request, context):
         """Форматирование деталей заявки в сообщение."""
-        user = self.db_session.query(User).filter_by(telegram_id=request.user_id).first()
+        # Заявка, комментарии и история статусов хранят telegram_id
+        # автора, поэтому вместо joinedload по FK загружаем всех
+        # причастных пользователей одним запросом по telegram_id.
+        comments = sorted(request.comments, key=lambda c: c.created_at)
+        history = None
+        if hasattr(request, 'status_history') and request.status_history:
+            try:
+                history = orjson.loads(request.status_history)
+            except Exception as e:
+                logger.error("Error parsing status history: %s", e)
+        telegram_ids = {request.user_id}
+        telegram_ids.update(c.telegram_id for c in comments if c.telegram_id)
+        if history:
+            telegram_ids.update(
+                entry.get('user_id') for entry in history if entry.get('user_id')
+            )
+        users_by_tid = {
+            u.telegram_id: u
+            for u in self.db_session.query(User).filter(User.telegram_id.in_(telegram_ids)).all()
+        }
+        user = users_by_tid.get(request.user_id)
         emoji = self.status_emoji.get(request.status, "")
 
-        message = f"{emoji} Заявка #{request.id}\n\n"
-        message += f"Проект: {self.config.PROJECTS.get(request.project, request.project)}\n"
+        # Детали собираются списком с одним join в конце вместо
+        # конкатенации строк по мере добавления блоков
+        parts = [f"{emoji} Заявка #{request.id}\n\n"]
+        parts.append(f"Проект: {self.config.PROJECTS.get(request.project, request.project)}\n")
         # Добавляем символ валюты к сумме
         currency_symbol = self.config.CURRENCY_SYMBOLS.get(request.currency, self.config.CURRENCY_SYMBOLS['DEFAULT'])
-        message += f"Сумма: {request.amount} {currency_symbol} {self.config.CURRENCIES.get(request.currency, request.currency)}\n"
-        message += f"Источник: {self.config.SOURCES.get(request.source, request.source)}\n"
-        message += f"От: {self._format_user_info(user)}\n"
+        parts.append(f"Сумма: {request.amount} {currency_symbol} {self.config.CURRENCIES.get(request.currency, request.currency)}\n")
+        parts.append(f"Источник: {self.config.SOURCES.get(request.source, request.source)}\n")
+        parts.append(f"От: {self._format_user_info(user)}\n")
         
         # Добавляем поле "Кому" если указан счет партнера
         if request.partner_account:
-            message += f"Кому: {request.partner_account}\n"
+            parts.append(f"Кому: {request.partner_account}\n")
             
-        message += f"Статус: {self.STATUS_DISPLAY.get(request.status.value, request.status.value)}\n"
-        message += f"Дата: {(request.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')}\n"
+        parts.append(f"Статус: {self.STATUS_DISPLAY.get(request.status.value, request.status.value)}\n")
+        parts.append(f"Дата: {_format_dt(request.created_at + timedelta(hours=timeDelta))}\n")
 
         # Формируем блок с деталями заявки в нужном порядке
         period_text = getattr(request, 'period', None) or context.user_data.get('period', None)
@@ -1601,44 +1820,43 @@ class BotHandlers:
                 elif line.strip():
                     note_text = line
         if period_text:
-            message += f"\nПериодичность: {period_text}"
+            parts.append(f"\nПериодичность: {period_text}")
         if date_period_text:
-            message += f"\n{date_period_text}"
+            parts.append(f"\n{date_period_text}")
         if note_text:
-            message += f"\nПримечание: {note_text}"
+            parts.append(f"\nПримечание: {note_text}")
 
         # Показываем историю статусов
-        if hasattr(request, 'status_history') and request.status_history:
+        if history:
             try:
-                history = json.loads(request.status_history)
-                message += "\n\nИстория статусов:"
+                parts.append("\n\nИстория статусов:")
                 for entry in history:
                     status = entry['status'].upper()
                     timestamp = datetime.fromisoformat(entry['timestamp'])
                     user_id = entry.get('user_id')
-                    user = self.db_session.query(User).filter_by(telegram_id=user_id).first() if user_id else None
+                    # Автор изменения берётся из общей предзагрузки
+                    user = users_by_tid.get(user_id) if user_id else None
                     user_info = self._format_user_info(user) if user else "Система"
                     status_display = self.STATUS_DISPLAY.get(status.lower(), status)
-                    formatted_date = (timestamp + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')
-                    message += f"\n- Изменён статус на {status_display} \n {formatted_date} - {user_info}"
+                    formatted_date = _format_dt(timestamp + timedelta(hours=timeDelta))
+                    parts.append(f"\n- Изменён статус на {status_display} \n {formatted_date} - {user_info}")
             except Exception as e:
-                logger.error(f"Error parsing status history: {e}")
-                message += f"\n\nТекущий статус: {self.STATUS_DISPLAY.get(request.status.value.lower(), request.status.value)}"
+                logger.error("Error rendering status history: %s", e)
+                parts.append(f"\n\nТекущий статус: {self.STATUS_DISPLAY.get(request.status.value.lower(), request.status.value)}")
         else:
-            message += f"\n\nТекущий статус: {self.STATUS_DISPLAY.get(request.status.value.lower(), request.status.value)}"
+            parts.append(f"\n\nТекущий статус: {self.STATUS_DISPLAY.get(request.status.value.lower(), request.status.value)}")
 
         # Показываем комментарии
-        comments = get_request_comments(self.db_session, request.id)
         if comments:
-            message += "\n\nКомментарии:"
+            parts.append("\n\nКомментарии:")
             for comment in comments:
-                # Ищем пользователя по telegram_id из комментария
-                comment_user = self.db_session.query(User).filter_by(telegram_id=comment.telegram_id).first()
+                # Берём пользователя из предзагруженного словаря по telegram_id
+                comment_user = users_by_tid.get(comment.telegram_id)
                 user_info = self._format_user_info(comment_user) if comment_user else "Неизвестный пользователь"
-                formatted_date = (comment.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M:%S')
-                message += f"\n\n💬 {comment.text}\n👤 {user_info}\n🕒 {formatted_date}"
+                formatted_date = _format_dt_seconds(comment.created_at + timedelta(hours=timeDelta))
+                parts.append(f"\n\n💬 {comment.text}\n👤 {user_info}\n🕒 {formatted_date}")
 
-        return message
+        return "".join(parts)
 
     def _create_request_actions_keyboard(self, request, request_id):
         """Создание клавиатуры с действиями для заявки."""
@@ -1666,18 +1884,26 @@ class BotHandlers:
         """Просмотр деталей заявки по ID."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Если request_id не передан, извлекаем его из callback_data
             if request_id is None and query.data.startswith('view_'):
-                request_id = int(query.data.split('_')[1])
+                request_id = int(query.data.rpartition('_')[2])
+
+            # Повторное нажатие в течение TTL обслуживаем из кэша без похода в БД
+            cache_key = (update.effective_user.id, request_id)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                message, reply_markup = cached
+                await self._safe_edit(query, message, reply_markup=reply_markup)
+                return VIEWING_REQUEST_DETAILS
 
-            request = get_request(self.db_session, request_id)
+            request = await self._get_request_details_cached(request_id)
 
             if not request:
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "❌ Заявка не найдена.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
 
@@ -1687,13 +1913,13 @@ class BotHandlers:
             is_owner = request.user_id == user_id
 
             if not (is_admin or is_owner):
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "❌ У вас нет прав для просмотра этой заявки.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
 
-            message = self._format_request_details(request, context)
+            message = await self._run_db(self._format_request_details, request, context)
             keyboard = self._create_request_actions_keyboard(request, request_id)
             reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1722,21 +1948,22 @@ class BotHandlers:
                         # Удаляем предыдущее сообщение с деталями
                         await query.message.delete()
                 except Exception as e:
-                    logger.error(f"Error sending document: {e}")
+                    logger.error("Error sending document: %s", e)
                     # Обновляем сообщение о загрузке на сообщение об ошибке
                     await loading_message.edit_text(
                         f"❌ Не удалось отправить документ к заявке #{request_id}"
                     )
                     # Отправляем сообщение с деталями без документа
-                    await query.edit_message_text(message, reply_markup=reply_markup)
+                    await self._safe_edit(query, message, reply_markup=reply_markup)
             else:
                 # Если документа нет, просто отправляем сообщение с деталями
-                await query.edit_message_text(message, reply_markup=reply_markup)
+                self._store_response(cache_key, (message, reply_markup))
+                await self._safe_edit(query, message, reply_markup=reply_markup)
 
             return VIEWING_REQUEST_DETAILS
 
         except Exception as e:
-            logger.error(f"Error in view_request_details_by_id: {e}")
+            logger.error("Error in view_request_details_by_id: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "viewing request details")
             return VIEWING_REQUESTS
@@ -1746,7 +1973,9 @@ class BotHandlers:
         text = update.message.text.strip()
         if text.isdigit():
             request_id = int(text)
-            request = get_request(self.db_session, request_id)
+            # Комментарии подгружаются сразу в потоке загрузки: ленивый доступ
+            # из другого потока пула гонял бы чужую сессию
+            request = await self._run_db(get_request_with_details, self.db_session, request_id)
             if request:
                 # Проверяем права доступа
                 user_id = update.effective_user.id
@@ -1754,13 +1983,13 @@ class BotHandlers:
                 is_owner = request.user_id == user_id
 
                 if not (is_admin or is_owner):
-                    await update.message.reply_text(
+                    await self._safe_reply(update.message, 
                         "❌ У вас нет прав для просмотра этой заявки.",
-                        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                        reply_markup=BACK_TO_LIST_MARKUP
                     )
                     return VIEWING_REQUESTS
 
-                message = self._format_request_details(request, context)
+                message = await self._run_db(self._format_request_details, request, context)
                 keyboard = self._create_request_actions_keyboard(request, request_id)
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1786,33 +2015,33 @@ class BotHandlers:
                             # Удаляем сообщение о загрузке
                             await loading_message.delete()
                     except Exception as e:
-                        logger.error(f"Error sending document: {e}")
+                        logger.error("Error sending document: %s", e)
                         # Обновляем сообщение о загрузке на сообщение об ошибке
                         await loading_message.edit_text(
                             f"❌ Не удалось отправить документ к заявке #{request_id}"
                         )
                         # Отправляем сообщение с деталями без документа
-                        await update.message.reply_text(message, reply_markup=reply_markup)
+                        await self._safe_reply(update.message, message, reply_markup=reply_markup)
                 else:
                     # Если документа нет, просто отправляем сообщение с деталями
-                    await update.message.reply_text(message, reply_markup=reply_markup)
+                    await self._safe_reply(update.message, message, reply_markup=reply_markup)
 
                 return VIEWING_REQUEST_DETAILS
             else:
-                await update.message.reply_text(f"Заявка с ID {request_id} не найдена.")
+                await self._safe_reply(update.message, f"Заявка с ID {request_id} не найдена.")
                 return VIEWING_REQUESTS
         else:
-            await update.message.reply_text("Пожалуйста, введите корректный ID заявки (число).")
+            await self._safe_reply(update.message, "Пожалуйста, введите корректный ID заявки (число).")
             return VIEWING_REQUESTS
 
     async def handle_request_navigation(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle request list navigation."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
-            logger.info(f"=== Navigation Handler Start ===")
-            logger.info(f"Callback data: {query.data}")
+            logger.info("=== Navigation Handler Start ===")
+            logger.info("Callback data: %s", query.data)
 
             if query.data.startswith("filter_"):
                 return await self._handle_filter(query, context)
@@ -1839,14 +2068,12 @@ class BotHandlers:
                     page = context.user_data.get('request_page', 0)
                     
                     # Получаем заявки для текущего фильтра
-                    status_filter = None
-                    if filter_type != "all":
-                        status_filter = getattr(RequestStatus, filter_type.upper(), None)
+                    status_filter = _FILTER_TO_STATUS.get(filter_type)
                     
-                    requests, total = get_requests_paginated(self.db_session, status=status_filter, page=page, page_size=5)
+                    requests, total = await self._run_db(get_requests_paginated, self.db_session, status=status_filter, page=page, page_size=5)
                     total_pages = (total + 5 - 1) // 5
                     
-                    message, keyboard = self._create_request_list_message(requests, context)
+                    message, keyboard = await self._run_db(self._create_request_list_message, requests, context)
                     message += f"\nСтраница {page+1} из {total_pages} | Всего заявок: {total}"
                     
                     # Проверяем, содержит ли текущее сообщение документ
@@ -1861,7 +2088,7 @@ class BotHandlers:
                         await query.message.delete()
                     else:
                         # Если сообщение не содержит документ, редактируем его
-                        await query.edit_message_text(
+                        await self._safe_edit(query, 
                             text=message,
                             reply_markup=InlineKeyboardMarkup(keyboard)
                         )
@@ -1872,13 +2099,13 @@ class BotHandlers:
                     return await self._show_filter_menu(Update(update_id=0, callback_query=query), context)
             elif query.data.startswith("request_"):
                 # Обработка нажатия на заявку
-                request_id = int(query.data.split('_')[1])
+                request_id = int(query.data.rpartition('_')[2])
                 return await self.view_request_details_by_id(update, context, request_id)
 
             return VIEWING_REQUESTS
 
         except Exception as e:
-            logger.error(f"Error in handle_request_navigation: {e}")
+            logger.error("Error in handle_request_navigation: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "navigation")
             return VIEWING_REQUESTS
@@ -1896,25 +2123,39 @@ class BotHandlers:
             await query.message.delete()
         else:
             # If no document, just edit the message
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 text=text,
                 reply_markup=reply_markup
             )
 
+    async def _dispatch_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """Единая точка входа экрана деталей заявки.
+
+        Разводит approve/reject/edit/comment, возврат к списку и просмотр
+        по префиксу callback_data без повторного прогона регэкспов PTB.
+        """
+        data = update.callback_query.data
+        if data == "back_to_list":
+            return await self.handle_request_navigation(update, context)
+        if data.startswith("view_"):
+            return await self.view_request_details_by_id(update, context)
+        return await self.handle_request_action(update, context)
+
     async def handle_request_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle request actions (approve, reject, edit, comment)."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
-            action, request_id = query.data.split('_')
-            request_id = int(request_id)
-            request = get_request(self.db_session, request_id)
+            # partition вместо split: без промежуточного списка на каждый колбэк
+            action, _, tail = query.data.partition('_')
+            request_id = int(tail)
+            request = await self._run_db(get_request, self.db_session, request_id)
 
             if not request:
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "❌ Заявка не найдена.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
 
@@ -1931,7 +2172,8 @@ class BotHandlers:
                 if request.status == RequestStatus.PENDING:
                     # Добавляем метку времени при изменении статуса
                     timestamp = (datetime.now() + timedelta(hours=timeDelta)).strftime('%d.%m.%Y %H:%M')
-                    update_request_status(self.db_session, request_id, RequestStatus.WAITING, user_id)
+                    await self._run_db(update_request_status, self.db_session, request_id, RequestStatus.WAITING, user_id)
+                    self._invalidate_request_responses(request_id)
                     
                     # Логируем изменение статуса
                     self._log_status_change(request_id, user_id, RequestStatus.PENDING, RequestStatus.WAITING)
@@ -1948,14 +2190,15 @@ class BotHandlers:
                         await query.message.delete()
                     else:
                         # Если документа нет, редактируем существующее сообщение
-                        await query.edit_message_text(
+                        await self._safe_edit(query, 
                             f"✅ Заявка одобрена и ожидает оплаты. {timestamp}",
                             reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 К заявке", callback_data=f"view_{request_id}")]])
                         )
                 elif request.status == RequestStatus.WAITING:
                     # Добавляем метку времени при изменении статуса
                     timestamp = datetime.now().strftime('%d.%m.%Y %H:%M')
-                    update_request_status(self.db_session, request_id, RequestStatus.PAID, user_id)
+                    await self._run_db(update_request_status, self.db_session, request_id, RequestStatus.PAID, user_id)
+                    self._invalidate_request_responses(request_id)
                     
                     # Логируем изменение статуса
                     self._log_status_change(request_id, user_id, RequestStatus.WAITING, RequestStatus.PAID)
@@ -1972,7 +2215,7 @@ class BotHandlers:
                         await query.message.delete()
                     else:
                         # Если документа нет, редактируем существующее сообщение
-                        await query.edit_message_text(
+                        await self._safe_edit(query, 
                             f"✅ Заявка отмечена как оплаченная. {timestamp}",
                             reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 К заявке", callback_data=f"view_{request_id}")]])
                         )
@@ -2000,7 +2243,7 @@ class BotHandlers:
                     await query.message.delete()
                 else:
                     # Если документа нет, редактируем существующее сообщение
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "❗ Укажите причину отклонения заявки:\n(обязательное поле)",
                         reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data=f"view_{request_id}")]])
                     )
@@ -2036,7 +2279,7 @@ class BotHandlers:
                     await query.message.delete()
                 else:
                     # Если документа нет, редактируем существующее сообщение
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Выберите, что хотите изменить:",
                         reply_markup=reply_markup
                     )
@@ -2058,7 +2301,7 @@ class BotHandlers:
                     await query.message.delete()
                 else:
                     # Если документа нет, редактируем существующее сообщение
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         "Введите ваш комментарий:",
                         reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Отмена", callback_data=f"view_{request_id}")]])
                     )
@@ -2067,7 +2310,7 @@ class BotHandlers:
             return VIEWING_REQUEST_DETAILS
 
         except Exception as e:
-            logger.error(f"Error in handle_request_action: {e}")
+            logger.error("Error in handle_request_action: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "handling request action")
             return VIEWING_REQUESTS
@@ -2076,27 +2319,30 @@ class BotHandlers:
         """Handle edit choice selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Обработка установки валюты
             if query.data.startswith("set_currency_"):
-                _, _, currency_id, request_id = query.data.split('_')
+                tail = query.data[len("set_currency_"):]
+                currency_id, _, request_id = tail.partition('_')
                 request_id = int(request_id)
                 
                 # Обновляем валюту в базе данных
-                update_request(self.db_session, request_id, currency=currency_id)
-                
+                await self._run_db(update_request, self.db_session, request_id, currency=currency_id)
+                self._invalidate_request_responses(request_id)
+
                 # Возвращаемся к просмотру деталей заявки
                 return await self.view_request_details_by_id(update, context, request_id)
 
-            action, field, request_id = query.data.split('_')
+            action, _, tail = query.data.partition('_')
+            field, _, request_id = tail.partition('_')
             request_id = int(request_id)
-            request = get_request(self.db_session, request_id)
+            request = await self._run_db(get_request, self.db_session, request_id)
 
             if not request:
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "❌ Заявка не найдена.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
 
@@ -2137,7 +2383,7 @@ class BotHandlers:
             request_text += f"Создана: {request.created_at.strftime('%d.%m.%Y %H:%M')}\n"
                 
             if field == "amount":
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     f"{request_text}\n"
                     f"Текущая сумма: {request.amount}\n\n"
                     "Введите новую сумму:",
@@ -2166,7 +2412,7 @@ class BotHandlers:
                     await query.message.delete()
                 else:
                     # Если документа нет, редактируем существующее сообщение
-                    await query.edit_message_text(
+                    await self._safe_edit(query, 
                         f"{request_text}\n"
                         f"Текущая валюта: {self.config.CURRENCIES.get(request.currency, 'Undefined')} ({request.currency})\n\n"
                         "Выберите новую валюту:",
@@ -2185,7 +2431,7 @@ class BotHandlers:
                 keyboard.append([InlineKeyboardButton("🔙 Отмена", callback_data=f"view_{request_id}")])
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     f"{request_text}\n"
                     f"Текущий источник: {self.config.SOURCES.get(request.source, 'Undefined')}\n\n"
                     "Выберите новый источник:",
@@ -2196,7 +2442,7 @@ class BotHandlers:
                 context.user_data['current_period'] = period_text
                 context.user_data['current_date'] = date_text
                 
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     f"{request_text}\n"
                     f"Текущее примечание: {note_text or 'Нет примечания'}\n\n"
                     "Введите новое примечание:",
@@ -2206,7 +2452,7 @@ class BotHandlers:
             return EDITING_REQUEST
 
         except Exception as e:
-            logger.error(f"Error in handle_edit_choice: {e}")
+            logger.error("Error in handle_edit_choice: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "edit choice selection")
             request_id = context.user_data.get('editing_request_id')
@@ -2216,17 +2462,18 @@ class BotHandlers:
 
     async def handle_edit_source(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         query = update.callback_query
-        await query.answer()
+        self._ack(query)
         request_id = context.user_data.get('editing_request_id')
         if query.data.startswith("set_"):
             source_id = query.data.replace("set_", "")
-            update_request(self.db_session, request_id, source=source_id)
-            await query.edit_message_text(f"Источник успешно изменен на: {self.config.SOURCES[source_id]}")
+            await self._run_db(update_request, self.db_session, request_id, source=source_id)
+            self._invalidate_request_responses(request_id)
+            await self._safe_edit(query, f"Источник успешно изменен на: {self.config.SOURCES[source_id]}")
             return await self.view_request_details_by_id(update, context, request_id)
         elif query.data.startswith("view_"):
             return await self.view_request_details_by_id(update, context, request_id)
         else:
-            await query.edit_message_text("Некорректный выбор источника.")
+            await self._safe_edit(query, "Некорректный выбор источника.")
             return EDITING_SOURCE
     
     async def handle_edit_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -2236,17 +2483,17 @@ class BotHandlers:
             field = context.user_data.get('editing_field')
             
             if not request_id or not field:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Произошла ошибка при редактировании заявки.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
             
-            request = get_request(self.db_session, request_id)
+            request = await self._run_db(get_request, self.db_session, request_id)
             if not request:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Заявка не найдена.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
             
@@ -2256,10 +2503,10 @@ class BotHandlers:
                 # Validate based on field type
                 if field == 'amount':
                     validated_value = validate_amount(value)
-                    update_request(self.db_session, request_id, amount=validated_value)
+                    await self._run_db(update_request, self.db_session, request_id, amount=validated_value)
                 elif field == 'partner_account':
                     validated_value = validate_partner_account(value)
-                    update_request(self.db_session, request_id, partner_account=validated_value)
+                    await self._run_db(update_request, self.db_session, request_id, partner_account=validated_value)
                 elif field == 'note':
                     validated_value = validate_note(value)
                     # Сохраняем периодичность и дату при обновлении примечания
@@ -2271,34 +2518,35 @@ class BotHandlers:
                     if validated_value:
                         note_parts.append(validated_value)
                     final_note = "\n".join(note_parts)
-                    update_request(self.db_session, request_id, note=final_note)
+                    await self._run_db(update_request, self.db_session, request_id, note=final_note)
                 elif field == 'period':
                     validated_value = validate_period(value)
-                    update_request(self.db_session, request_id, period=validated_value)
+                    await self._run_db(update_request, self.db_session, request_id, period=validated_value)
                 elif field == 'date':
                     validated_value = validate_date(value)
-                    update_request(self.db_session, request_id, date=validated_value)
+                    await self._run_db(update_request, self.db_session, request_id, date=validated_value)
                 else:
                     validated_value = validate_edit_value(value)
-                    update_request(self.db_session, request_id, **{field: validated_value})
-                
-                await update.message.reply_text(
+                    await self._run_db(update_request, self.db_session, request_id, **{field: validated_value})
+
+                self._invalidate_request_responses(request_id)
+                await self._safe_reply(update.message, 
                     "✅ Изменения сохранены.",
                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📋 Детали заявки", callback_data=f"view_{request_id}")]])
                 )
                 return VIEWING_REQUEST_DETAILS
                 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return EDITING_REQUEST
             
         except Exception as e:
-            logger.error(f"Error in handle_edit_input: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_edit_input: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при сохранении изменений.",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                reply_markup=BACK_TO_LIST_MARKUP
             )
             return VIEWING_REQUESTS
 
@@ -2308,9 +2556,9 @@ class BotHandlers:
             request_id = context.user_data.get('commenting_request_id')
             
             if not request_id:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Произошла ошибка при добавлении комментария.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
             
@@ -2319,24 +2567,26 @@ class BotHandlers:
             try:
                 comment = validate_comment(comment_text)
                 # Получаем пользователя для получения его id
-                user = self.db_session.query(User).filter_by(telegram_id=update.effective_user.id).first()
+                user = await self._run_db(self._get_cached_user, update.effective_user.id)
                 if not user:
-                    await update.message.reply_text(
+                    await self._safe_reply(update.message, 
                         "❌ Ошибка: пользователь не найден в базе данных.",
-                        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                        reply_markup=BACK_TO_LIST_MARKUP
                     )
                     return VIEWING_REQUESTS
                 
                 # Добавляем комментарий с правильными id
-                add_comment(
+                await self._run_db(
+                    add_comment,
                     self.db_session,
                     request_id,
                     user.id,  # id из таблицы users
                     comment,
                     telegram_id=update.effective_user.id  # telegram_id пользователя
                 )
-                
-                await update.message.reply_text(
+                self._invalidate_request_responses(request_id)
+
+                await self._safe_reply(update.message, 
                     f"✅ Комментарий к заявке #{request_id} добавлен.",
                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📋 Детали заявки", callback_data=f"view_{request_id}")]])
                 )
@@ -2344,16 +2594,16 @@ class BotHandlers:
                 return VIEWING_REQUEST_DETAILS
                 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return ADDING_COMMENT
             
         except Exception as e:
-            logger.error(f"Error in handle_comment: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_comment: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при добавлении комментария.",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                reply_markup=BACK_TO_LIST_MARKUP
             )
             return VIEWING_REQUESTS
 
@@ -2363,9 +2613,9 @@ class BotHandlers:
             request_id = context.user_data.get('rejecting_request_id')
             
             if not request_id:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     "❌ Произошла ошибка при отклонении заявки.",
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                    reply_markup=BACK_TO_LIST_MARKUP
                 )
                 return VIEWING_REQUESTS
             
@@ -2373,7 +2623,8 @@ class BotHandlers:
             
             try:
                 reason = validate_rejection_reason(reason_text)
-                update_request_status(self.db_session, request_id, RequestStatus.REJECTED, reason)
+                await self._run_db(update_request_status, self.db_session, request_id, RequestStatus.REJECTED, reason)
+                self._invalidate_request_responses(request_id)
                 
                 # Log status change
                 self._log_status_change(
@@ -2384,7 +2635,7 @@ class BotHandlers:
                     reason
                 )
                 
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"✅ Заявка #{request_id} отклонена.",
                     reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📋 Детали заявки", callback_data=f"view_{request_id}")]])
                 )
@@ -2392,16 +2643,16 @@ class BotHandlers:
                 return VIEWING_REQUEST_DETAILS
                 
             except ValueError as e:
-                await update.message.reply_text(
+                await self._safe_reply(update.message, 
                     f"❌ {str(e)}"
                 )
                 return ADDING_REJECTION_REASON
             
         except Exception as e:
-            logger.error(f"Error in handle_rejection_reason: {e}")
-            await update.message.reply_text(
+            logger.error("Error in handle_rejection_reason: %s", e)
+            await self._safe_reply(update.message, 
                 "❌ Произошла ошибка при отклонении заявки.",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data="back_to_list")]])
+                reply_markup=BACK_TO_LIST_MARKUP
             )
             return VIEWING_REQUESTS
 
@@ -2420,10 +2671,10 @@ class BotHandlers:
             }
             
             with open('logDB.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+                f.write(orjson.dumps(log_entry, default=str).decode() + '\n')
                 
         except Exception as e:
-            logger.error(f"Error logging status change: {e}")
+            logger.error("Error logging status change: %s", e)
 
     def _log_comment(self, request_id: int, user_id: int, comment_text: str):
         """Логирование добавления комментария."""
@@ -2438,10 +2689,10 @@ class BotHandlers:
             }
             
             with open('logDB.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+                f.write(orjson.dumps(log_entry, default=str).decode() + '\n')
                 
         except Exception as e:
-            logger.error(f"Error logging comment: {e}")
+            logger.error("Error logging comment: %s", e)
 
     def _log_request_creation(self, request_id: int, user_id: int, request_data: dict):
         """Логирование создания заявки."""
@@ -2456,75 +2707,89 @@ class BotHandlers:
             }
             
             with open('logDB.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+                f.write(orjson.dumps(log_entry, default=str).decode() + '\n')
                 
         except Exception as e:
-            logger.error(f"Error logging request creation: {e}")
+            logger.error("Error logging request creation: %s", e)
 
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle errors."""
-        logger.error(f"Update {update} caused error: {context.error}")
+        logger.exception("Update %s caused error", update, exc_info=context.error)
+
+        if update is None:
+            return
+
+        error_text = (
+            "❌ Произошла ошибка. Пожалуйста, попробуйте позже или обратитесь в техподдержку @butterglobe\n\n"
+            "Для возобновления работы используйте /start"
+        )
+
+        # Для callback-запроса достаточно одного edit_message_text вместо
+        # пары send_message + reply_text — на один вызов API меньше
+        if update.callback_query:
+            try:
+                await update.callback_query.answer()
+                await self._safe_edit(update.callback_query, error_text, reply_markup=SUPPORT_MARKUP)
+                return
+            except BadRequest:
+                # Сообщение удалено или не изменилось — отправляем новое ниже
+                pass
+            except Exception as e:
+                logger.exception("Error in error handler: %s", e)
+                return
 
         try:
-            # Send error message to user
             if update.effective_chat:
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text="❌ Произошла ошибка. Пожалуйста, попробуйте позже или обратитесь в техподдержку @butterglobe"
-                )
-
-            # Restart the conversation
-            if update.callback_query:
-                message = update.callback_query.message
-                await message.reply_text("Для возобновления работы используйте /start")
-            elif update.message:
-                await update.message.reply_text("Для возобновления работы используйте /start")
+                await context.bot.send_message(chat_id=update.effective_chat.id, text=error_text)
         except Exception as e:
-            logger.error(f"Error in error handler: {e}")
+            logger.exception("Error in error handler: %s", e)
 
     async def _handle_error(self, query, action_type):
         """Handle errors in handlers."""
         try:
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 f"❌ Произошла ошибка при {action_type}. Пожалуйста, попробуйте позже или обратитесь в техподдержку @butterglobe\n\n"
                 "Для возобновления работы используйте команду /start",
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🆘 Техподдержка", url="https://t.me/butterglobe")]])
+                reply_markup=SUPPORT_MARKUP
             )
         except Exception as e:
-            logger.error(f"Error in error handler: {e}")
+            logger.exception("Error in error handler: %s", e)
 
     async def view_my_requests(self, query, context) -> int:
         """Просмотр заявок пользователя."""
         try:
             user_id = query.from_user.id
-            requests = get_requests(self.db_session, user_id=user_id)
+            requests = await self._run_db(get_requests, self.db_session, user_id=user_id)
             
             # Устанавливаем флаг, что пользователь просматривает свои заявки
             context.user_data['viewing_my_requests'] = True
             
             if not requests:
                 keyboard = [[InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]]
-                await query.edit_message_text(
+                await self._safe_edit(query, 
                     "У вас пока нет созданных заявок.",
                     reply_markup=InlineKeyboardMarkup(keyboard)
                 )
                 return ADMIN_MENU
 
-            message = "📋 Ваши заявки:\n\n"
+            # Список частей + один join вместо конкатенации в цикле
+            parts = ["📋 Ваши заявки:\n\n"]
             keyboard = []
 
             for req in requests:
                 emoji = self.status_emoji.get(req.status, "")
-                user = self.db_session.query(User).filter_by(telegram_id=req.user_id).first()
+                user = await self._run_db(self._get_cached_user, req.user_id)
                 
                 # Получаем название валюты и символ из словарей
                 currency_name = self.config.CURRENCIES.get(req.currency, req.currency)
                 currency_symbol = self.config.CURRENCY_SYMBOLS.get(req.currency, self.config.CURRENCY_SYMBOLS['DEFAULT'])
                 
-                message += f"{emoji} #{req.id} - {self.config.PROJECTS[req.project]} - "
-                message += f"{req.amount} {currency_symbol} {currency_name} - {self._format_user_info(user)}\n"
-                message += f"Создано: {(req.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')}  "
-                message += f"Изменено: {(req.updated_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')}\n\n"
+                parts.append(
+                    f"{emoji} #{req.id} - {self.config.PROJECTS[req.project]} - "
+                    f"{req.amount} {currency_symbol} {currency_name} - {self._format_user_info(user)}\n"
+                    f"Создано: {_format_dt(req.created_at + timedelta(hours=timeDelta))}  "
+                    f"Изменено: {_format_dt(req.updated_at + timedelta(hours=timeDelta))}\n\n"
+                )
                 
                 keyboard.append([InlineKeyboardButton(
                     f"{self.status_emoji.get(req.status, '')} #{req.id} - {req.amount} {currency_symbol} {currency_name}",
@@ -2534,11 +2799,11 @@ class BotHandlers:
             keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")])
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(message, reply_markup=reply_markup)
+            await self._safe_edit(query, "".join(parts), reply_markup=reply_markup)
             return VIEWING_REQUESTS
 
         except Exception as e:
-            logger.error(f"Error in view_my_requests: {e}")
+            logger.error("Error in view_my_requests: %s", e)
             if 'query' in locals():
                 await self._handle_error(query, "viewing my requests")
             return ADMIN_MENU
@@ -2547,7 +2812,7 @@ class BotHandlers:
         """Handle data export functionality."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Проверяем права доступа
             user_id = update.effective_user.id
@@ -2557,20 +2822,14 @@ class BotHandlers:
                 await query.answer("У вас нет прав для экспорта данных", show_alert=True)
                 return ADMIN_MENU
 
-            keyboard = [
-                [InlineKeyboardButton("📊 Экспорт по заявкам", callback_data="export_requests")],
-                [InlineKeyboardButton("📈 Экспорт по пользователям", callback_data="export_users")],
-                [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
-            ]
-
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 "Выберите тип экспорта:",
-                reply_markup=InlineKeyboardMarkup(keyboard)
+                reply_markup=self.config.EXPORT_MENU_KEYBOARD
             )
             return EXPORT_MENU
 
         except Exception as e:
-            logger.error(f"Error in handle_export_data: {e}")
+            logger.error("Error in handle_export_data: %s", e)
             await self._handle_error(query, "export data")
             return ADMIN_MENU
 
@@ -2578,7 +2837,7 @@ class BotHandlers:
         """Handle export format selection."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Проверяем права доступа
             user_id = update.effective_user.id
@@ -2588,7 +2847,7 @@ class BotHandlers:
                 await query.answer("У вас нет прав для экспорта данных", show_alert=True)
                 return ADMIN_MENU
 
-            export_type = query.data.split('_')[1]  # requests or users
+            export_type = query.data.split('_', 2)[1]  # requests or users
             context.user_data['export_type'] = export_type
 
             keyboard = [
@@ -2597,14 +2856,14 @@ class BotHandlers:
                 [InlineKeyboardButton("🔙 Назад", callback_data="export_data")]
             ]
 
-            await query.edit_message_text(
+            await self._safe_edit(query, 
                 "Выберите формат экспорта:",
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
             return EXPORT_FORMAT
 
         except Exception as e:
-            logger.error(f"Error in handle_export_format: {e}")
+            logger.error("Error in handle_export_format: %s", e)
             await self._handle_error(query, "export format")
             return ADMIN_MENU
 
@@ -2612,7 +2871,7 @@ class BotHandlers:
         """Process the actual export."""
         try:
             query = update.callback_query
-            await query.answer()
+            self._ack(query)
 
             # Проверяем права доступа
             user_id = update.effective_user.id
@@ -2623,10 +2882,10 @@ class BotHandlers:
                 return ADMIN_MENU
 
             export_type = context.user_data.get('export_type')
-            format_type = query.data.split('_')[-1]  # excel or csv
+            format_type = query.data.rpartition('_')[2]  # excel or csv
 
             # Show loading message
-            loading_message = await query.edit_message_text(
+            loading_message = await self._safe_edit(query, 
                 "⏳ Подготовка данных для экспорта...\nЭто может занять некоторое время."
             )
 
@@ -2635,7 +2894,7 @@ class BotHandlers:
             try:
                 if export_type == 'requests':
                     # Получаем заявки с учетом прав доступа
-                    requests, _ = self._get_requests_for_user(user_id, page_size=1000)  # Большой размер страницы для получения всех данных
+                    requests, _ = await self._run_db(self._get_requests_for_user, user_id, page_size=1000)  # Большой размер страницы для получения всех данных
                     data = []
                     for req in requests:
                         req_dict = {
@@ -2645,8 +2904,8 @@ class BotHandlers:
                             'Валюта': self.config.CURRENCIES.get(req.currency, req.currency),
                             'Источник': self.config.SOURCES.get(req.source, req.source),
                             'Статус': self.STATUS_DISPLAY.get(req.status.value, req.status.value),
-                            'Создано': (req.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M'),
-                            'Изменено': (req.updated_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')
+                            'Создано': _format_dt(req.created_at + timedelta(hours=timeDelta)),
+                            'Изменено': _format_dt(req.updated_at + timedelta(hours=timeDelta))
                         }
                         if req.note:
                             req_dict['Примечание'] = req.note
@@ -2654,7 +2913,7 @@ class BotHandlers:
                             req_dict['Счет партнера'] = req.partner_account
                         data.append(req_dict)
                 else:  # users
-                    users = self.db_session.query(User).all()
+                    users = await self._run_db(lambda: self.db_session.query(User).all())
                     data = []
                     for user in users:
                         user_dict = {
@@ -2662,7 +2921,7 @@ class BotHandlers:
                             'Telegram ID': user.telegram_id,
                             'Username': user.username,
                             'First Name': user.first_name,
-                            'Created At': (user.created_at + timedelta(hours=timeDelta)).strftime('%d/%m/%Y %H:%M')
+                            'Created At': _format_dt(user.created_at + timedelta(hours=timeDelta))
                         }
                         data.append(user_dict)
 
@@ -2698,32 +2957,16 @@ class BotHandlers:
             return EXPORT_MENU
 
         except Exception as e:
-            logger.error(f"Error in process_export: {e}")
+            logger.error("Error in process_export: %s", e)
             await self._handle_error(query, "export process")
             return ADMIN_MENU
 
     def _format_user_info(self, user):
-        """Optimized user info formatting with caching."""
+        """Отображаемое имя пользователя для рендеров списков и деталей."""
         if not user:
             return "Неизвестный пользователь"
-            
-        cache_key = f"user_info_{user.id}"
-        if cache_key in self._user_cache:
-            cache_time, info = self._user_cache[cache_key]
-            if (datetime.now() - cache_time).total_seconds() < self._cache_timeout:
-                return info
-        
-        if hasattr(user, 'first_name') and user.first_name:
-            info = user.first_name
-        elif hasattr(user, 'username') and user.username:
-            info = f"@{user.username}"
-        elif hasattr(user, 'telegram_id'):
-            info = f"user_{user.telegram_id}"
-        else:
-            info = f"user_{user.id}"
-            
-        self._user_cache[cache_key] = (datetime.now(), info)
-        return info
+        # Строка кэшируется на самом объекте User (cached_property)
+        return user.display_name
 
     def _get_filter_keyboard(self) -> list:
         """Generate filter keyboard for request viewing."""
@@ -2736,6 +2979,103 @@ class BotHandlers:
             [InlineKeyboardButton("🔙 Назад", callback_data="back_to_menu")]
         ]
 
+
+# Составной фильтр текстовых сообщений без команд собирается один раз:
+# выражение с операторами создаёт новые объекты фильтров при каждом вычислении
+_TEXT_ONLY = filters.TEXT & ~filters.COMMAND
+
+# Бот обрабатывает только сообщения и нажатия inline-кнопок; остальные типы
+# обновлений (члены чата, опросы и т.д.) Telegram может не присылать вовсе
+_ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+
+def _build_conv_handler(handlers):
+    """Собрать ConversationHandler с полной таблицей состояний.
+
+    Таблица строится на уровне модуля, а не методом Bot: структура диалога —
+    статическая конфигурация, ей не нужны ни состояние инстанса, ни
+    cached_property. Объекты-обработчики создаются один раз на вызов.
+
+    block=False позволяет PTB обрабатывать обновления из разных чатов
+    параллельно: медленный запрос к БД в одном чате не блокирует остальные.
+    """
+    states = {
+        ADMIN_MENU: [
+            CallbackQueryHandler(handlers.handle_admin_callback, block=False)
+        ],
+        CHOOSING_PROJECT: [
+            CallbackQueryHandler(handlers.project_selected, block=False)
+        ],
+        ENTERING_AMOUNT: [
+            MessageHandler(_TEXT_ONLY, handlers.amount_entered, block=False)
+        ],
+        CHOOSING_CURRENCY: [
+            CallbackQueryHandler(handlers.currency_selected, block=False)
+        ],
+        CHOOSING_SOURCE: [
+            CallbackQueryHandler(handlers.source_selected, block=False)
+        ],
+        ATTACHING_DOCUMENT: [
+            CallbackQueryHandler(handlers.handle_document, pattern=ATTACH_PATTERN, block=False),
+            CallbackQueryHandler(handlers.handle_partner_account, pattern=PARTNER_PATTERN, block=False),
+            CallbackQueryHandler(handlers.handle_document, pattern=SKIP_PATTERN, block=False),
+            MessageHandler(filters.Document.ALL | filters.PHOTO, handlers.handle_document, block=False)
+        ],
+        ENTERING_PARTNER_ACCOUNT: [
+            MessageHandler(_TEXT_ONLY, handlers.handle_partner_account_input, block=False)
+        ],
+        ENTERING_NOTE: [
+            CallbackQueryHandler(handlers.handle_note, block=False),
+            MessageHandler(_TEXT_ONLY, handlers.handle_custom_note, block=False)
+        ],
+        CHOOSING_PERIOD: [
+            CallbackQueryHandler(handlers.handle_period, block=False),
+            MessageHandler(_TEXT_ONLY, handlers.handle_period_input, block=False)
+        ],
+        CHOOSING_DATE: [
+            CallbackQueryHandler(handlers.handle_date, pattern=DATE_PATTERN, block=False),
+            MessageHandler(_TEXT_ONLY, handlers.handle_date, block=False)
+        ],
+        CONFIRMING_REQUEST: [
+            CallbackQueryHandler(handlers.confirm_request, block=False)
+        ],
+        VIEWING_REQUESTS: [
+            CallbackQueryHandler(handlers.handle_request_navigation, block=False),
+            MessageHandler(_TEXT_ONLY, handlers.handle_request_id_input, block=False)
+        ],
+        VIEWING_REQUEST_DETAILS: [
+            CallbackQueryHandler(handlers._dispatch_detail, pattern=DETAIL_ACTION_PATTERN, block=False)
+        ],
+        EDITING_REQUEST: [
+            CallbackQueryHandler(handlers.handle_edit_choice, pattern=EDIT_OR_VIEW_PATTERN, block=False),
+            CallbackQueryHandler(handlers.handle_edit_choice, pattern=SET_CURRENCY_PATTERN, block=False),
+            MessageHandler(_TEXT_ONLY, handlers.handle_edit_input, block=False)
+        ],
+        EDITING_SOURCE: [
+            CallbackQueryHandler(handlers.handle_edit_source, block=False)
+        ],
+        ADDING_COMMENT: [
+            MessageHandler(_TEXT_ONLY, handlers.handle_comment, block=False)
+        ],
+        ADDING_REJECTION_REASON: [
+            MessageHandler(_TEXT_ONLY, handlers.handle_rejection_reason, block=False)
+        ],
+        EXPORTING_DATA: [
+            CallbackQueryHandler(handlers.handle_export_format, block=False)
+        ]
+    }
+    return ConversationHandler(
+        entry_points=[CommandHandler('start', handlers.start, block=False)],
+        states=states,
+        fallbacks=[CommandHandler('start', handlers.start, block=False)],
+        per_message=False,
+        per_chat=True,
+        block=False,
+        name="manager_conversation",
+        persistent=True
+    )
+
+
 class Bot:
     """Main bot class."""
     def __init__(self):
@@ -2751,92 +3091,74 @@ class Bot:
     def run(self):
         """Start the bot."""
         try:
-            application = Application.builder().token(self.config.TELEGRAM_TOKEN).build()
-
-            # Add conversation handler
-            conv_handler = ConversationHandler(
-                entry_points=[CommandHandler('start', self.handlers.start)],
-                states={
-                    ADMIN_MENU: [
-                        CallbackQueryHandler(self.handlers.handle_admin_callback)
-                    ],
-                    CHOOSING_PROJECT: [
-                        CallbackQueryHandler(self.handlers.project_selected)
-                    ],
-                    ENTERING_AMOUNT: [
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.amount_entered)
-                    ],
-                    CHOOSING_CURRENCY: [
-                        CallbackQueryHandler(self.handlers.currency_selected)
-                    ],
-                    CHOOSING_SOURCE: [
-                        CallbackQueryHandler(self.handlers.source_selected)
-                    ],
-                    ATTACHING_DOCUMENT: [
-                        CallbackQueryHandler(self.handlers.handle_document, pattern="^attach$"),
-                        CallbackQueryHandler(self.handlers.handle_partner_account, pattern="^partner$"),
-                        CallbackQueryHandler(self.handlers.handle_document, pattern="^skip$"),
-                        MessageHandler(filters.Document.ALL | filters.PHOTO, self.handlers.handle_document)
-                    ],
-                    ENTERING_PARTNER_ACCOUNT: [
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_partner_account_input)
-                    ],
-                    ENTERING_NOTE: [
-                        CallbackQueryHandler(self.handlers.handle_note),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_custom_note)
-                    ],
-                    CHOOSING_PERIOD: [
-                        CallbackQueryHandler(self.handlers.handle_period),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_period_input)
-                    ],
-                    CHOOSING_DATE: [
-                        CallbackQueryHandler(self.handlers.handle_date, pattern="^date_"),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_date)
-                    ],
-                    CONFIRMING_REQUEST: [
-                        CallbackQueryHandler(self.handlers.confirm_request)
-                    ],
-                    VIEWING_REQUESTS: [
-                        CallbackQueryHandler(self.handlers.handle_request_navigation),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_request_id_input)
-                    ],
-                    VIEWING_REQUEST_DETAILS: [
-                        CallbackQueryHandler(self.handlers.handle_request_action, pattern="^(approve|reject|edit|comment)_"),
-                        CallbackQueryHandler(self.handlers.handle_request_navigation, pattern="^back_to_list$"),
-                        CallbackQueryHandler(self.handlers.view_request_details_by_id, pattern="^view_")
-                    ],
-                    EDITING_REQUEST: [
-                        CallbackQueryHandler(self.handlers.handle_edit_choice, pattern="^(edit_|view_)"),
-                        CallbackQueryHandler(self.handlers.handle_edit_choice, pattern="^set_currency_"),
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_edit_input)
-                    ],
-                    EDITING_SOURCE: [
-                        CallbackQueryHandler(self.handlers.handle_edit_source)
-                    ],
-                    ADDING_COMMENT: [
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_comment)
-                    ],
-                    ADDING_REJECTION_REASON: [
-                        MessageHandler(filters.TEXT & ~filters.COMMAND, self.handlers.handle_rejection_reason)
-                    ],
-                    EXPORTING_DATA: [
-                        CallbackQueryHandler(self.handlers.handle_export_format)
-                    ]
-                },
-                fallbacks=[CommandHandler('start', self.handlers.start)],
-                per_message=False,
-                per_chat=True
+            # concurrent_updates позволяет обрабатывать обновления параллельными
+            # asyncio-задачами вместо последовательной очереди
+            builder = (
+                Application.builder()
+                .token(self.config.TELEGRAM_TOKEN)
+                .concurrent_updates(256)
+                .rate_limiter(AIORateLimiter(
+                    overall_max_rate=30,
+                    overall_time_period=1,
+                    # Лимит Telegram на групповые чаты: не больше 20 сообщений в минуту
+                    group_max_rate=20,
+                    group_time_period=60,
+                    max_retries=3,
+                ))
+                # Состояния диалогов переживают перезапуск бота
+                .persistence(PicklePersistence(filepath='bot_state.pickle'))
+                # HTTP/2 мультиплексирует параллельные вызовы API по одному
+                # соединению; увеличенный пул убирает ожидание свободного коннекта
+                .request(ORJSONRequest(
+                    connection_pool_size=256,
+                    http_version="2",
+                    read_timeout=20,
+                    write_timeout=20,
+                ))
+                .get_updates_request(ORJSONRequest(http_version="2"))
             )
+            if self.config.BASE_URL:
+                builder = builder.base_url(self.config.BASE_URL)
+            if self.config.BASE_FILE_URL:
+                builder = builder.base_file_url(self.config.BASE_FILE_URL)
+            application = builder.build()
 
-            application.add_handler(conv_handler)
+            # Add conversation handler
+            application.add_handler(_build_conv_handler(self.handlers))
             application.add_error_handler(self.handlers.error_handler)
 
             logger.info("Starting bot...")
-            application.run_polling(allowed_updates=Update.ALL_TYPES)
+            if self.config.WEBHOOK_URL:
+                # Вебхук убирает задержку опроса getUpdates: обновления
+                # приходят мгновенно входящими HTTP-запросами
+                application.run_webhook(
+                    listen=self.config.WEBHOOK_LISTEN,
+                    port=self.config.WEBHOOK_PORT,
+                    webhook_url=self.config.WEBHOOK_URL,
+                    secret_token=self.config.WEBHOOK_SECRET_TOKEN,
+                    allowed_updates=_ALLOWED_UPDATES,
+                )
+            else:
+                # Длинный опрос: timeout держит соединение getUpdates открытым
+                # до 30 секунд, poll_interval=0 убирает паузу между запросами
+                application.run_polling(
+                    allowed_updates=_ALLOWED_UPDATES,
+                    timeout=30,
+                    poll_interval=0.0,
+                )
         except Exception as e:
-            logger.error(f"Error in main: {e}")
+            logger.exception("Error in main: %s", e)
             raise
 
 if __name__ == '__main__':
+    # uvloop заметно ускоряет сетевой ввод-вывод asyncio; на платформах без
+    # него (Windows) бот продолжает работать на стандартном событийном цикле
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("uvloop event loop policy installed")
+    except ImportError:
+        pass
+
     bot = Bot()
     bot.run()
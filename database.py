@@ -1,9 +1,13 @@
+import os
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from functools import cached_property
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship, selectinload
+from sqlalchemy.pool import QueuePool
 import enum
-import json
+
+import orjson
 
 Base = declarative_base()
 
@@ -24,6 +28,19 @@ class User(Base):
     
     requests = relationship("Request", back_populates="user")
 
+    @cached_property
+    def display_name(self):
+        """Отображаемое имя пользователя: @username или подпись по id.
+
+        cached_property считает строку один раз на загруженный объект —
+        списки и детали заявок рендерят её многократно.
+        """
+        if self.username:
+            return f"@{self.username}"
+        if self.telegram_id is not None:
+            return f"user_{self.telegram_id}"
+        return f"user_{self.id}"
+
 class Request(Base):
     __tablename__ = 'requests'
     
@@ -60,12 +77,37 @@ class Comment(Base):
     request = relationship("Request", back_populates="comments")
     user = relationship("User")
 
-def init_db(db_url="sqlite:///bot.db"):
-    """Initialize database connection and create tables."""
-    engine = create_engine(db_url)
+def init_db(db_url=None):
+    """Initialize database connection and create tables.
+
+    Возвращает scoped_session поверх пула соединений: при конкурентной
+    обработке обновлений каждый поток получает собственную сессию вместо
+    одной общей на весь бот.
+
+    URL базы берётся из переменной окружения DATABASE_URL, что позволяет
+    переключить деплой на выделенный сервер БД (например PostgreSQL) без
+    изменения кода; по умолчанию используется локальный SQLite-файл.
+    """
+    if db_url is None:
+        db_url = os.getenv("DATABASE_URL", "sqlite:///bot.db")
+    engine = create_engine(
+        db_url,
+        poolclass=QueuePool,
+        pool_size=25,
+        max_overflow=10,
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False} if db_url.startswith("sqlite") else {},
+    )
+    if db_url.startswith("sqlite"):
+        # WAL разрешает читателям работать параллельно с писателем:
+        # без него любая запись блокирует все конкурентные чтения
+        @event.listens_for(engine, "connect")
+        def _enable_wal(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.close()
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 
 def get_or_create_user(session, telegram_id, username, role="user"):
     """Get existing user or create new one."""
@@ -98,7 +140,7 @@ def update_request_status(session, request_id, status, user_id=None):
         history = []
         if request.status_history:
             try:
-                history = json.loads(request.status_history)
+                history = orjson.loads(request.status_history)
             except:
                 history = []
         
@@ -111,7 +153,7 @@ def update_request_status(session, request_id, status, user_id=None):
         
         # Обновляем статус и историю
         request.status = status
-        request.status_history = json.dumps(history)
+        request.status_history = orjson.dumps(history).decode()
         session.commit()
     return request
 
@@ -148,6 +190,20 @@ def get_requests_paginated(session, status=None, page=0, page_size=5):
 def get_request(session, request_id):
     return session.query(Request).filter_by(id=request_id).first()
 
+def get_request_with_details(session, request_id):
+    """Получить заявку с предзагруженными комментариями.
+
+    selectinload выбирает все комментарии одним дополнительным SELECT,
+    чтобы просмотр деталей не делал отдельный запрос на каждое обращение
+    к request.comments.
+    """
+    return (
+        session.query(Request)
+        .options(selectinload(Request.comments))
+        .filter_by(id=request_id)
+        .first()
+    )
+
 def get_request_comments(session, request_id):
     return session.query(Comment).filter_by(request_id=request_id).order_by(Comment.created_at).all()
 
@@ -1,55 +1,116 @@
 import re
+import sys
+from collections.abc import Collection
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation
-from datetime import datetime
-
-
-def validate_amount(amount_str: str) -> float:
-    """Validate and sanitize amount input. Returns float if valid, raises ValueError otherwise."""
+from datetime import date, datetime
+
+# Шаблоны компилируются один раз при импорте: внутренний кэш re ограничен
+# и общий на процесс, так что горячие валидаторы не должны зависеть от него
+_DATE_DMY_RE = re.compile(r'^(\d{2})\.(\d{2})\.(\d{4})$')
+# translate с готовой таблицей удаляет опасные символы за один проход по C-коду
+_STRIP_TABLE = str.maketrans('', '', '<>"\'`')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Граничные значения суммы как Decimal, чтобы сравнение не приводило типы
+_AMOUNT_ZERO = Decimal(0)
+_AMOUNT_MAX = Decimal('1000000000')  # Максимальная сумма 1 миллиард
+
+# Предопределённые периоды: frozenset интернированных строк даёт O(1)
+# проверку принадлежности без создания списка на каждый вызов
+_PERIOD_LABELS = frozenset(map(sys.intern, ("Единоразово", "Ежемесячно", "Еженедельно")))
+
+# Границы длины и готовые сообщения об ошибках: рендерятся один раз при
+# импорте, чтобы на пути ошибки не оставалось форматирования
+_REJ_MIN, _REJ_MAX = 2, 200
+_REJ_ERR = f"Причина отклонения должна содержать от {_REJ_MIN} до {_REJ_MAX} символов."
+_EDIT_MIN, _EDIT_MAX = 1, 100
+_EDIT_ERR = f"Значение должно содержать от {_EDIT_MIN} до {_EDIT_MAX} символов."
+_PARTNER_MIN, _PARTNER_MAX = 2, 100
+_PARTNER_ERR = f"Счет партнера должен содержать от {_PARTNER_MIN} до {_PARTNER_MAX} символов."
+
+
+def validate_amount(amount_str: str) -> Decimal:
+    """Validate and sanitize amount input. Returns Decimal if valid, raises ValueError otherwise."""
     try:
-        amount = Decimal(amount_str.replace(',', '.'))
-        if amount <= 0:
+        if ',' in amount_str:
+            amount_str = amount_str.replace(',', '.')
+        amount = Decimal(amount_str)
+        if amount <= _AMOUNT_ZERO:
             raise ValueError("Сумма должна быть больше нуля")
-        if amount > 1000000000:  # Максимальная сумма 1 миллиард
+        if amount > _AMOUNT_MAX:
             raise ValueError("Сумма слишком большая")
         return amount
     except (InvalidOperation, ValueError):
         raise ValueError("Неверный формат суммы. Используйте числа и точку/запятую")
 
 
-def validate_currency(currency: str, allowed_currencies: list) -> str:
+
+@lru_cache(maxsize=None)
+def _allowed_error(prefix: str, allowed: tuple) -> str:
+    """Сообщение об ошибке со списком допустимых значений.
+
+    Наборы валют/проектов/источников фиксированы на время работы бота,
+    поэтому join выполняется один раз на набор, а не на каждый неверный ввод.
+    """
+    return f"{prefix}: {', '.join(allowed)}"
+
+
+def validate_currency(currency: str, allowed_currencies: Collection[str]) -> str:
     """Validate and sanitize currency input. Returns sanitized string if valid, raises ValueError otherwise."""
     if currency not in allowed_currencies:
-        raise ValueError(f"Неверная валюта. Доступные валюты: {', '.join(allowed_currencies)}")
+        raise ValueError(_allowed_error("Неверная валюта. Доступные валюты", tuple(allowed_currencies)))
     return currency
 
 
-def validate_project(project: str, allowed_projects: list) -> str:
+def validate_project(project: str, allowed_projects: Collection[str]) -> str:
     """Validate and sanitize project input. Returns sanitized string if valid, raises ValueError otherwise."""
     if project not in allowed_projects:
-        raise ValueError(f"Неверный проект. Доступные проекты: {', '.join(allowed_projects)}")
+        raise ValueError(_allowed_error("Неверный проект. Доступные проекты", tuple(allowed_projects)))
     return project
 
 
-def validate_source(source: str, allowed_sources: list) -> str:
+def validate_source(source: str, allowed_sources: Collection[str]) -> str:
     """Validate and sanitize source input. Returns sanitized string if valid, raises ValueError otherwise."""
     if source not in allowed_sources:
-        raise ValueError(f"Неверный источник. Доступные источники: {', '.join(allowed_sources)}")
+        raise ValueError(_allowed_error("Неверный источник. Доступные источники", tuple(allowed_sources)))
     return source
 
 
+
+def _parse_dmy(date_str: str) -> datetime:
+    """Разбор даты ДД.ММ.ГГГГ без strptime: группы шаблона сразу в datetime.
+
+    Конструктор datetime сам проверяет диапазоны месяца и дня, поэтому
+    некорректные даты по-прежнему дают ValueError.
+    """
+    m = _DATE_DMY_RE.match(date_str)
+    if not m:
+        raise ValueError(date_str)
+    return datetime(int(m[3]), int(m[2]), int(m[1]))
+
+
 def validate_date(date_str: str) -> str:
     """Validate and sanitize date input. Accepts YYYY-MM-DD or DD.MM.YYYY. Returns ISO format if valid, raises ValueError otherwise."""
     date_str = date_str.strip()
     try:
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-            dt = datetime.strptime(date_str, '%Y-%m-%d')
-        elif re.match(r'^\d{2}\.\d{2}\.\d{4}$', date_str):
-            dt = datetime.strptime(date_str, '%d.%m.%Y')
+        # Формат различается по длине и позиции разделителя, цифры
+        # проверяет isdigit (C-цикл, строже int: без знаков и пробелов);
+        # диапазоны месяца и дня валидирует конструктор date
+        if len(date_str) != 10:
+            raise ValueError
+        if (date_str[4] == '-' and date_str[7] == '-'
+                and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+            d = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+        elif (date_str[2] == '.' and date_str[5] == '.'
+                and date_str[:2].isdigit() and date_str[3:5].isdigit() and date_str[6:].isdigit()):
+            d = date(int(date_str[6:]), int(date_str[3:5]), int(date_str[:2]))
         else:
             raise ValueError
-        if dt < datetime.now():
+        if d < date.today():
             raise ValueError("Дата не может быть в прошлом")
-        return dt.date().isoformat()
+        return d.isoformat()
     except Exception:
         raise ValueError("Некорректный формат даты. Используйте ГГГГ-ММ-ДД или ДД.ММ.ГГГГ.")
 
@@ -65,25 +126,22 @@ def validate_period(period: str) -> str:
     period = period.strip()
     
     # Проверяем предопределенные периоды
-    allowed_periods = ["Единоразово", "Ежемесячно", "Еженедельно"]
-    if period in allowed_periods:
+    if period in _PERIOD_LABELS:
         return period
         
     # Проверяем формат даты или периода
     try:
         # Проверяем формат периода (DD.MM.YYYY-DD.MM.YYYY)
         if '-' in period:
-            start_date, end_date = period.split('-')
+            # maxsplit=1: делим строку ровно один раз, лишние дефисы
+            # останутся во второй половине и не пройдут разбор даты
+            start_date, end_date = period.split('-', 1)
             start_date = start_date.strip()
             end_date = end_date.strip()
             
-            # Проверяем формат обеих дат
-            datetime.strptime(start_date, '%d.%m.%Y')
-            datetime.strptime(end_date, '%d.%m.%Y')
-            
-            # Проверяем, что начальная дата не позже конечной
-            start = datetime.strptime(start_date, '%d.%m.%Y')
-            end = datetime.strptime(end_date, '%d.%m.%Y')
+            # Проверяем формат обеих дат и что начальная не позже конечной
+            start = _parse_dmy(start_date)
+            end = _parse_dmy(end_date)
             if start > end:
                 raise ValueError("Начальная дата не может быть позже конечной")
                 
@@ -91,7 +149,7 @@ def validate_period(period: str) -> str:
             
         # Проверяем формат одиночной даты (DD.MM.YYYY)
         else:
-            datetime.strptime(period, '%d.%m.%Y')
+            _parse_dmy(period)
             return period
             
     except ValueError as e:
@@ -100,63 +158,58 @@ def validate_period(period: str) -> str:
         raise ValueError("Некорректный формат периода. Используйте ДД.ММ.ГГГГ или ДД.ММ.ГГГГ-ДД.ММ.ГГГГ")
 
 
+
+def _validate_bounded(text: str, min_length: int, max_length: int, error: str) -> str:
+    """Общий путь текстовых валидаторов: strip, проверка длины, очистка."""
+    text = text.strip()
+    if not (min_length <= len(text) <= max_length):
+        raise ValueError(error)
+    return text.translate(_STRIP_TABLE)
+
+
+
+@lru_cache(maxsize=None)
+def _length_error(template: str, max_length: int) -> str:
+    """Рендер сообщения о границах длины один раз на значение max_length."""
+    return template.format(max_length)
+
+
 def validate_note(note: str, max_length: int = 1000) -> str:
     """Validate and sanitize note input. Returns sanitized string if valid, raises ValueError otherwise."""
-    note = note.strip()
-    if not (2 <= len(note) <= max_length):
-        raise ValueError(f"Примечание должно содержать от 2 до {max_length} символов.")
-    # Remove dangerous characters
-    note = re.sub(r'[<>"\'`]', '', note)
-    return note
+    return _validate_bounded(note, 2, max_length, _length_error("Примечание должно содержать от 2 до {} символов.", max_length))
 
 
 def validate_comment(comment: str, max_length: int = 500) -> str:
     """Validate and sanitize comment input. Returns sanitized string if valid, raises ValueError otherwise."""
-    comment = comment.strip()
-    if not (1 <= len(comment) <= max_length):
-        raise ValueError(f"Комментарий должен содержать от 1 до {max_length} символов.")
-    # Remove dangerous characters
-    comment = re.sub(r'[<>"\'`]', '', comment)
-    return comment
+    return _validate_bounded(comment, 1, max_length, _length_error("Комментарий должен содержать от 1 до {} символов.", max_length))
 
 
 def validate_rejection_reason(reason: str) -> str:
     """Validate and sanitize rejection reason input. Returns sanitized string if valid, raises ValueError otherwise."""
-    reason = reason.strip()
-    if not (2 <= len(reason) <= 200):
-        raise ValueError("Причина отклонения должна содержать от 2 до 200 символов.")
-    # Remove dangerous characters
-    reason = re.sub(r'[<>"\'`]', '', reason)
-    return reason
+    return _validate_bounded(reason, _REJ_MIN, _REJ_MAX, _REJ_ERR)
 
 
 def validate_edit_value(value: str) -> str:
     """Validate and sanitize generic edit input. Returns sanitized string if valid, raises ValueError otherwise."""
-    value = value.strip()
-    if not (1 <= len(value) <= 100):
-        raise ValueError("Значение должно содержать от 1 до 100 символов.")
-    value = re.sub(r'[<>"\'`]', '', value)
-    return value
+    return _validate_bounded(value, _EDIT_MIN, _EDIT_MAX, _EDIT_ERR)
 
 
 def validate_partner_account(account: str) -> str:
     """Validate and sanitize partner account input. Returns sanitized string if valid, raises ValueError otherwise."""
-    account = account.strip()
-    if not (2 <= len(account) <= 100):
-        raise ValueError("Счет партнера должен содержать от 2 до 100 символов.")
-    # Remove dangerous characters
-    account = re.sub(r'[<>"\'`]', '', account)
-    return account
+    return _validate_bounded(account, _PARTNER_MIN, _PARTNER_MAX, _PARTNER_ERR)
 
 
 def sanitize_input(text: str) -> str:
     """Очистка пользовательского ввода."""
     if not text:
         return text
-    # Удаляем HTML-теги
-    text = re.sub(r'<[^>]+>', '', text)
-    # Заменяем множественные пробелы на один
-    text = re.sub(r'\s+', ' ', text)
+    # Регэкспы запускаются только когда в строке есть что чистить:
+    # подстрочные проверки на C заметно дешевле прохода движка re
+    if '<' in text:
+        # Удаляем HTML-теги
+        text = _HTML_TAG_RE.sub('', text)
+    if '  ' in text or '\t' in text or '\n' in text:
+        # Заменяем множественные пробелы на один
+        text = _WS_RE.sub(' ', text)
     # Удаляем начальные и конечные пробелы
-    text = text.strip()
-    return text
+    return text.strip()